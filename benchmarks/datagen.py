@@ -0,0 +1,139 @@
+"""
+Synthetic dataset generator.
+
+Creates users, workspaces, notebooks, notes and tasks.txt files laid
+out like DATA_DIR, plus a credential store, under a root directory:
+
+    <root>/user_data/<user>/<workspace>/<notebook>/<note>.txt
+    <root>/user_data/<user>/<workspace>/tasks.txt
+    <root>/auth_data/credentials.db
+
+The same seed always produces the same data.
+
+Usage:
+    python -m benchmarks.datagen /tmp/notes-bench --users 2 --notes 1000
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+import argparse
+import random
+
+from src.auth.service import UserService
+from src.auth.store import SqliteCredentialStore
+
+WORDS = (
+    "python note task meeting project idea review design draft summary "
+    "deadline budget plan research question answer todo later urgent "
+    "client server index search query cache memory disk network thread"
+).split()
+
+PASSWORD = "Passw0rd!"
+
+
+@dataclass
+class DatasetSpec:
+    """Shape of a generated dataset."""
+
+    users: int = 1
+    workspaces: int = 2
+    notebooks: int = 2
+    notes: int = 100
+    tasks: int = 100
+    note_size: str = "uniform:200-4000"
+    iterations: Optional[int] = None
+    seed: int = 0
+
+
+def _note_size(rng: random.Random, distribution: str) -> int:
+    """
+    Draw a note size in bytes.
+
+    Distributions: "fixed:N", "uniform:A-B", "lognormal:MU,SIGMA".
+    """
+    kind, _, params = distribution.partition(":")
+    if kind == "fixed":
+        return int(params)
+    if kind == "uniform":
+        lo, hi = params.split("-")
+        return rng.randint(int(lo), int(hi))
+    if kind == "lognormal":
+        mu, sigma = params.split(",")
+        return int(rng.lognormvariate(float(mu), float(sigma)))
+    raise ValueError(f"Unknown size distribution: {distribution}")
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines) + "\n"
+
+
+def generate_dataset(root: Path, spec: DatasetSpec) -> Path:
+    """
+    Generate a dataset under root.
+
+    Notes are split evenly between each workspace and its notebooks.
+
+    Returns:
+        The user data directory (the equivalent of DATA_DIR)
+    """
+    rng = random.Random(spec.seed)
+    data_dir = Path(root) / "user_data"
+    store = SqliteCredentialStore(Path(root) / "auth_data" / "credentials.db")
+    kwargs = {"iterations": spec.iterations} if spec.iterations else {}
+    users = UserService(store=store, **kwargs)
+
+    for u in range(spec.users):
+        username = f"user{u}"
+        if not store.exists(username):
+            store.add(users.new_record(username, PASSWORD))
+        for w in range(spec.workspaces):
+            workspace = data_dir / username / f"workspace{w}"
+            targets = [workspace] + [workspace / f"notebook{n}" for n in range(spec.notebooks)]
+            for target in targets:
+                target.mkdir(parents=True, exist_ok=True)
+            for i in range(spec.notes):
+                target = targets[i % len(targets)]
+                (target / f"note_{i}.txt").write_text(
+                    _text(rng, _note_size(rng, spec.note_size)), encoding="utf-8"
+                )
+            with (workspace / "tasks.txt").open("w", encoding="utf-8") as f:
+                for t in range(spec.tasks):
+                    box = "[x]" if rng.random() < 0.3 else "[ ]"
+                    f.write(f"{box} {rng.choice(WORDS)} {rng.choice(WORDS)} {t}\n")
+    store.close()
+    return data_dir
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic notes dataset.")
+    parser.add_argument("root", type=Path, help="directory to create the dataset in")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--workspaces", type=int, default=2, help="per user")
+    parser.add_argument("--notebooks", type=int, default=2, help="per workspace")
+    parser.add_argument("--notes", type=int, default=100, help="per workspace")
+    parser.add_argument("--tasks", type=int, default=100, help="per workspace")
+    parser.add_argument("--note-size", default="uniform:200-4000",
+                        help='"fixed:N", "uniform:A-B" or "lognormal:MU,SIGMA" bytes')
+    parser.add_argument("--iterations", type=int, default=None, help="PBKDF2 iterations")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(
+        args.users, args.workspaces, args.notebooks, args.notes, args.tasks,
+        args.note_size, args.iterations, args.seed,
+    )
+    print(generate_dataset(args.root, spec))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""
+Service-layer benchmark harness.
+
+For each scale (notes and tasks per workspace) a fresh dataset is
+generated in a temporary directory and the service operations are
+timed. Results are written as JSON so runs from different commits can
+be compared.
+
+Usage:
+    python -m benchmarks.run --scales 100,1000 --output bench.json
+    python -m benchmarks.run --compare base.json bench.json
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.datagen import PASSWORD, DatasetSpec, generate_dataset
+from src.auth.service import UserService
+from src.auth.store import SqliteCredentialStore
+from src.services.note_service import NoteService
+from src.services.notebook_service import NotebookService
+from src.services.task_service import TaskService
+from src.services.workspace_service import WorkspaceService
+
+
+def _time(fn: Callable[[], object], runs: int, setup: Optional[Callable[[], object]] = None) -> Dict:
+    """Time fn over several runs (setup runs untimed before each)."""
+    samples = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "runs": runs,
+        "median_s": statistics.median(samples),
+        "p95_s": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_s": samples[0],
+    }
+
+
+def bench_scale(scale: int, runs: int, spec: DatasetSpec) -> List[Dict]:
+    """Run all benchmarks on one freshly generated dataset."""
+    results = []
+
+    def record(op: str, stats: Dict) -> None:
+        results.append({"scale": scale, "op": op, **stats})
+
+    with tempfile.TemporaryDirectory(prefix="notes-bench-") as tmp:
+        spec.notes = spec.tasks = scale
+        data_dir = generate_dataset(Path(tmp), spec)
+        user_dir = data_dir / "user0"
+        workspace = user_dir / "workspace0"
+
+        # Search: first call builds the index, later ones reuse it
+        notes = NoteService(workspace)
+        record("search_notes.cold", _time(lambda: NoteService(workspace).search_notes("deadline"),
+                                          1, setup=notes.index.discard))
+        record("search_notes.warm", _time(lambda: notes.search_notes("deadline"), runs))
+        record("search_notes.substring", _time(lambda: notes.search_notes("line b"), runs))
+        changed = workspace / "note_0.txt"
+        record("search_notes.one_changed", _time(
+            lambda: notes.search_notes("deadline"), runs,
+            setup=lambda: changed.write_text(changed.read_text() + "x\n"),
+        ))
+
+        # Listings
+        record("list_notes", _time(notes.list_notes, runs))
+        record("list_notebooks", _time(NotebookService(workspace).list_notebooks, runs))
+        record("list_workspaces", _time(WorkspaceService(user_dir).list_workspaces, runs))
+
+        # Tasks
+        tasks = TaskService(workspace)
+        record("toggle_task", _time(lambda: tasks.toggle_task(scale // 2 or 1), runs))
+        record("toggle_tasks.batch", _time(lambda: tasks.toggle_tasks(range(1, scale // 2 + 1)), runs))
+        record("delete_task", _time(lambda: tasks.delete_task(1), runs,
+                                    setup=lambda: tasks.create_task("benchmark task")))
+
+        # Login
+        store = SqliteCredentialStore(Path(tmp) / "auth_data" / "credentials.db")
+        kwargs = {"iterations": spec.iterations} if spec.iterations else {}
+        users = UserService(store=store, **kwargs)
+        record("login", _time(lambda: users.authenticate("user0", PASSWORD), max(1, runs // 5)))
+        store.close()
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> int:
+    """Print median ratios new/base; return 1 if any exceeds threshold."""
+    old = {(r["scale"], r["op"]): r for r in base["results"]}
+    regressed = False
+    for r in new["results"]:
+        before = old.get((r["scale"], r["op"]))
+        if before is None or before["median_s"] == 0:
+            continue
+        ratio = r["median_s"] / before["median_s"]
+        flag = " REGRESSION" if ratio > threshold else ""
+        regressed |= bool(flag)
+        print(f"{r['op']:<28} {r['scale']:>8} {before['median_s']*1000:10.3f} ms "
+              f"-> {r['median_s']*1000:10.3f} ms  x{ratio:5.2f}{flag}")
+    return 1 if regressed else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the Notes service layer.")
+    parser.add_argument("--scales", default="100,1000",
+                        help="comma-separated notes/tasks per workspace")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per operation")
+    parser.add_argument("--note-size", default="uniform:200-4000")
+    parser.add_argument("--iterations", type=int, default=None, help="PBKDF2 iterations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="JSON file (default stdout)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="ratio reported as a regression by --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        base, new = (json.loads(p.read_text(encoding="utf-8")) for p in args.compare)
+        return compare(base, new, args.threshold)
+
+    results = []
+    for scale in (int(s) for s in args.scales.split(",")):
+        spec = DatasetSpec(note_size=args.note_size, iterations=args.iterations, seed=args.seed)
+        results.extend(bench_scale(scale, args.runs, spec))
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
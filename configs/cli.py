@@ -0,0 +1,15 @@
+"""
+Command-line interface configuration for Notes application.
+"""
+
+# Median wall-clock budget for one non-interactive command, checked by
+# `python -m src.cli.commands startup-check`
+STARTUP_BUDGET_MS = 150
+
+# Environment variables used to authenticate non-interactive commands
+ENV_TOKEN = "NOTES_TOKEN"
+ENV_USER = "NOTES_USER"
+ENV_PASSWORD = "NOTES_PASSWORD"
+
+# Entries shown per page in menu listings
+PAGE_SIZE = 20
@@ -0,0 +1,16 @@
+"""
+Logging configuration for Notes application.
+"""
+
+import logging
+
+# Size of one log file before it is rotated, and how many old files to keep
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Minimum level written to the log file and echoed to the console
+LOG_LEVEL = logging.INFO
+CONSOLE_LOG_LEVEL = logging.WARNING
+
+# Seconds between metrics exports while the interactive app runs
+METRICS_EXPORT_SECONDS = 15
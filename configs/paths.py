@@ -11,7 +11,10 @@ ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "user_data"
 CREDENTIALS_DIR = ROOT / "auth_data"
 CREDENTIALS_FILE = CREDENTIALS_DIR / "credentials.csv"
+CREDENTIALS_DB = CREDENTIALS_DIR / "credentials.db"
+TOKEN_KEY_FILE = CREDENTIALS_DIR / "token.key"
 
 # Logging directories
 LOG_DIR = ROOT / "logs"
 LOG_FILE = LOG_DIR / "app.log"
+METRICS_FILE = LOG_DIR / "metrics.prom"
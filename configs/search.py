@@ -0,0 +1,33 @@
+"""
+Search configuration for Notes application.
+"""
+
+import os
+
+# Characters read per chunk when scanning a note's content
+SCAN_CHUNK_CHARS = 1 << 20
+
+# Worker processes for content scans (defaults to CPU count)
+SCAN_WORKERS = os.cpu_count() or 1
+
+# Below this many bytes in total a scan runs in-process
+SCAN_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# BM25 ranking parameters (term frequency saturation, length normalization)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Results returned by a ranked search unless asked otherwise
+RANKED_TOP_K = 10
+
+# Characters of context shown around the first match in a snippet
+SNIPPET_CHARS = 80
+
+# Threads searching a user's workspaces concurrently
+USER_SEARCH_WORKERS = 8
+
+# Seconds the menu waits for a search across all workspaces
+USER_SEARCH_TIMEOUT = 10.0
+
+# Bytes of a note a regex search reads at most (the rest is skipped)
+REGEX_MAX_BYTES_PER_FILE = 16 * 1024 * 1024
@@ -3,4 +3,16 @@ Security configuration for Notes application.
 """
 
 PBKDF2_ITERATIONS = 100_000
+PBKDF2_ALGORITHM = "sha256"
 SALT_BYTES = 16
+
+# Hash parameters assumed for credential rows stored before they were
+# recorded per row
+LEGACY_PBKDF2_ITERATIONS = 100_000
+LEGACY_PBKDF2_ALGORITHM = "sha256"
+
+# Credential storage backend: "sqlite" (indexed) or "csv" (legacy)
+CREDENTIAL_BACKEND = "sqlite"
+
+# Lifetime of CLI access tokens (see src.auth.tokens)
+TOKEN_TTL_SECONDS = 12 * 60 * 60
@@ -0,0 +1,47 @@
+"""
+Note storage configuration for Notes application.
+"""
+
+import os
+
+# Notes at least this large are stored gzip-compressed by compaction
+COMPRESS_MIN_BYTES = 1024 * 1024
+
+# Notes not modified for this many days are compressed by compaction
+COMPRESS_COLD_DAYS = 90
+
+# gzip compression level (1 fastest .. 9 smallest)
+COMPRESS_LEVEL = 6
+
+# Hidden directory holding the version history of a directory's notes
+HISTORY_DIR_NAME = ".history"
+
+# Deltas applied at most to rebuild a version; a full copy is stored
+# whenever a note's chain would grow longer
+HISTORY_MAX_CHAIN = 16
+
+# Versions larger than this are streamed into full copies instead of
+# being held in memory to compute a delta
+HISTORY_DELTA_MAX_BYTES = 4 * 1024 * 1024
+
+# Uncompressed bytes per independently compressed block of an archive
+ARCHIVE_BLOCK_BYTES = 1024 * 1024
+
+# Threads compressing archive blocks
+ARCHIVE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Hidden per-user directory holding deleted workspaces and notebooks
+TRASH_DIR_NAME = ".trash"
+
+# Days a deleted workspace or notebook can be restored before it is purged
+TRASH_RETENTION_DAYS = 7
+
+# Seconds between two runs of the background trash reaper
+TRASH_REAP_INTERVAL = 3600
+
+# Hidden per-directory folder caching note metadata (see src.services.manifest)
+MANIFEST_DIR_NAME = ".manifest"
+MANIFEST_FILE_NAME = "notes.json"
+
+# Seconds after its last change a note edited in place stops being re-stat'ed
+MANIFEST_DIRTY_SECONDS = 24 * 3600
@@ -1,20 +1,29 @@
 """
 CLI entry point for Notes Application.
+
+Without arguments the interactive menu starts; with arguments the
+non-interactive subcommands in src.cli.commands run instead.
 """
 
 import logging
-from src.auth.service import UserService
-
-from src.utils.logger import configure_logging
-from src.cli.main_menu import main_menu
-from src.cli.workspace_menu import workspace_menu
+import sys
 
-configure_logging()
 logger = logging.getLogger("notes.app")
 
 
 def run() -> None:
-    """Application entry point."""
+    """Interactive menu loop."""
+    from src.auth.service import UserService
+    from src.utils.console import echo, echo_error
+    from src.utils.logger import configure_logging
+    from src.utils.metrics import start_exporter
+    from src.cli.main_menu import main_menu
+    from src.cli.workspace_menu import workspace_menu
+    from configs.logs import METRICS_EXPORT_SECONDS
+    from configs.paths import METRICS_FILE
+
+    configure_logging()
+    start_exporter(METRICS_FILE, METRICS_EXPORT_SECONDS)
     user_service = UserService()
 
     while True:
@@ -24,31 +33,40 @@ def run() -> None:
             if choice == 1:
                 try:
                     user_service.signup()
-                    logger.info("Signup successful")
+                    echo("Signup successful")
                 except Exception as exc:
-                    logger.error("Signup failed: %s", exc)
+                    echo_error("Signup failed: %s", exc)
 
             elif choice == 2:
                 try:
                     username = user_service.login()
                     workspace_menu(username)  
                 except Exception as exc:
-                    logger.error("Login failed: %s", exc)
+                    echo_error("Login failed: %s", exc)
 
             elif choice == 3:
-                logger.info("Exiting application")
+                echo("Exiting application")
                 return
 
             else:
-                logger.error("Invalid choice")
+                echo_error("Invalid choice")
 
         except KeyboardInterrupt:
-            logger.info("Interrupted. Exiting.")
+            echo("Interrupted. Exiting.")
             return
         except Exception:
             logger.exception("Unhandled error")
             return
 
 
-if __name__ == "__main__":
+def main() -> int:
+    """Application entry point."""
+    if len(sys.argv) > 1:
+        from src.cli.commands import main as commands_main
+        return commands_main(sys.argv[1:])
     run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
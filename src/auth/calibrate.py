@@ -0,0 +1,62 @@
+"""
+PBKDF2 cost calibration.
+
+Benchmarks hashlib.pbkdf2_hmac on this host and recommends the
+iteration count that meets a target login latency.
+
+Usage:
+    python -m src.auth.calibrate --target-ms 100 [--algorithm sha256]
+"""
+
+from typing import Optional, Sequence
+import argparse
+import hashlib
+import time
+
+from configs.security import PBKDF2_ALGORITHM, PBKDF2_ITERATIONS
+
+
+def measure_ms(iterations: int, algorithm: str = PBKDF2_ALGORITHM, rounds: int = 3) -> float:
+    """Return the fastest of several timed hashes, in milliseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac(algorithm, b"calibration", b"0" * 32, iterations)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate_iterations(
+    target_ms: float,
+    algorithm: str = PBKDF2_ALGORITHM,
+    sample_iterations: int = 20_000,
+) -> int:
+    """
+    Recommend an iteration count whose hash takes about target_ms.
+
+    Returns:
+        Iteration count rounded down to a multiple of 1000 (at least 1000)
+    """
+    if target_ms <= 0:
+        raise ValueError("Target latency must be positive")
+    per_iteration = measure_ms(sample_iterations, algorithm) / sample_iterations
+    recommended = int(target_ms / per_iteration) // 1000 * 1000
+    return max(1000, recommended)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Recommend PBKDF2_ITERATIONS for this host.")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="target hash latency")
+    parser.add_argument("--algorithm", default=PBKDF2_ALGORITHM, help="HMAC digest name")
+    args = parser.parse_args(argv)
+
+    current = measure_ms(PBKDF2_ITERATIONS, args.algorithm)
+    recommended = calibrate_iterations(args.target_ms, args.algorithm)
+    print(f"current:     PBKDF2_ITERATIONS = {PBKDF2_ITERATIONS:_} ({current:.1f} ms)")
+    print(f"recommended: PBKDF2_ITERATIONS = {recommended:_} (~{args.target_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,28 @@
+"""
+Password hashing primitives.
+
+Kept as module-level functions so they can run in worker processes.
+"""
+
+import hashlib
+
+
+def hash_password(password: str, salt: str, iterations: int, algorithm: str = "sha256") -> str:
+    """
+    Hash password using PBKDF2-HMAC.
+
+    Args:
+        password: Plaintext password
+        salt: Salt in hex string
+        iterations: PBKDF2 iteration count
+        algorithm: HMAC digest name (e.g. "sha256", "sha512")
+
+    Returns:
+        Hexadecimal password hash
+    """
+    return hashlib.pbkdf2_hmac(
+        algorithm,
+        password.encode("utf-8"),
+        salt.encode("utf-8"),
+        iterations
+    ).hex()
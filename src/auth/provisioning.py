@@ -0,0 +1,129 @@
+"""
+Bulk user provisioning.
+
+Input formats (chosen by file extension):
+    .csv    header row with username,password
+    .jsonl  one {"username": ..., "password": ...} object per line
+
+Usage:
+    python -m src.auth.provisioning users.csv [--workers N]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import json
+import secrets
+import logging
+
+from .hashing import hash_password
+from .service import UserService
+from .store import CredentialRecord
+from .validator import validate_password_strength
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProvisionReport:
+    """Outcome of a bulk import."""
+
+    created: List[str] = field(default_factory=list)
+    rejected: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def read_accounts(source: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (username, password) pairs from a CSV or JSONL file.
+
+    Raises:
+        ValueError: if a line or row is malformed
+    """
+    source = Path(source)
+    with source.open(newline="", encoding="utf-8") as f:
+        if source.suffix.lower() == ".jsonl":
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    yield str(row["username"]).strip(), str(row["password"])
+                except (ValueError, KeyError, TypeError) as exc:
+                    raise ValueError(f"{source}:{lineno}: invalid account line") from exc
+        else:
+            for row in csv.DictReader(f):
+                try:
+                    yield row["username"].strip(), row["password"]
+                except (KeyError, AttributeError) as exc:
+                    raise ValueError(f"{source}: expected username,password columns") from exc
+
+
+def _hash_entry(entry: Tuple[str, str, int, str]) -> str:
+    return hash_password(*entry)
+
+
+def bulk_signup(
+    service: UserService,
+    source: Path,
+    workers: Optional[int] = None,
+) -> ProvisionReport:
+    """
+    Create many users non-interactively.
+
+    Passwords are validated with validate_password_strength, hashed on a
+    process pool and all new rows are written in one atomic batch.
+    """
+    report = ProvisionReport()
+    known = set(service.store.usernames())
+
+    accepted: List[Tuple[str, str, str]] = []
+    for username, password in read_accounts(source):
+        if not username:
+            report.rejected.append((username, "Username cannot be empty"))
+        elif username in known:
+            report.rejected.append((username, "Username already exists"))
+        elif not validate_password_strength(password):
+            report.rejected.append((username, "Password too weak"))
+        else:
+            known.add(username)
+            accepted.append((username, password, secrets.token_hex(service.salt_bytes)))
+
+    if not accepted:
+        return report
+
+    jobs = [
+        (password, salt, service.iterations, service.algorithm)
+        for _, password, salt in accepted
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = list(pool.map(_hash_entry, jobs, chunksize=max(1, len(jobs) // 64)))
+
+    records = [
+        CredentialRecord(username, salt, pwd_hash, service.algorithm, service.iterations)
+        for (username, _, salt), pwd_hash in zip(accepted, hashes)
+    ]
+    service.store.add_many(records)
+    report.created = [r.username for r in records]
+    logger.info("Bulk signup: %d created, %d rejected", len(report.created), len(report.rejected))
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Bulk-create users from a CSV or JSONL file.")
+    parser.add_argument("source", type=Path, help="CSV or JSONL file of usernames and passwords")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes")
+    args = parser.parse_args(argv)
+
+    report = bulk_signup(UserService(), args.source, workers=args.workers)
+    for username, reason in report.rejected:
+        print(f"rejected {username!r}: {reason}")
+    print(f"{len(report.created)} users created, {len(report.rejected)} rejected")
+    return 0 if not report.rejected else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,63 +2,62 @@
 Authentication service.
 Handles user signup and login.
 
-CSV format:
-    username,salt,password_hash
+Credentials are kept in a CredentialStore (see src.auth.store).
 
 Responsibilities:
 - Signup users with password validation
 - Login users securely 
 """
 
-import csv
 from pathlib import Path
+from typing import Optional
 import secrets
-import hashlib
 import logging
 
 from src.utils.helpers import safe_input
+from src.utils.metrics import timed
 from .validator import validate_password_strength
+from .hashing import hash_password
+from .store import CredentialRecord, CredentialStore, open_store
 
 from configs.paths import CREDENTIALS_FILE
-from configs.security import PBKDF2_ITERATIONS, SALT_BYTES
+from configs.security import PBKDF2_ALGORITHM, PBKDF2_ITERATIONS, SALT_BYTES
 
 logger = logging.getLogger(__name__)
 
 
 class UserService:
     """
-    Handles user signup and login using a CSV file.
+    Handles user signup and login using a credential store.
     """
 
     def __init__(
         self,
         credentials_file: Path = CREDENTIALS_FILE,
         iterations: int = PBKDF2_ITERATIONS,
-        salt_bytes: int = SALT_BYTES
+        salt_bytes: int = SALT_BYTES,
+        store: Optional[CredentialStore] = None,
+        algorithm: str = PBKDF2_ALGORITHM,
     ):
         """
         Initialize the authentication service.
 
         Args:
-            credentials_file: Path to the CSV file storing credentials
+            credentials_file: Path to the legacy CSV credentials file; the SQLite
+                database is kept next to it
             iterations: PBKDF2 iteration count
             salt_bytes: Number of bytes for generated salt
+            store: Credential store (defaults to the configured backend)
+            algorithm: PBKDF2 HMAC digest name
         """
-        self.users_file = credentials_file
+        self.store = store or open_store(credentials_file=credentials_file)
         self.iterations = iterations
         self.salt_bytes = salt_bytes
-
-        # Create CSV file with header 
-        if not self.users_file.exists():
-            self.users_file.parent.mkdir(parents=True, exist_ok=True)
-            with self.users_file.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["username", "salt", "password_hash"])
-            logger.info("Credentials file created: %s", self.users_file)
+        self.algorithm = algorithm
 
     def _hash_password(self, password: str, salt: str) -> str:
         """
-        Hash password using PBKDF2-HMAC-SHA256.
+        Hash password with the configured PBKDF2 parameters.
 
         Args:
             password: Plaintext password
@@ -67,12 +66,18 @@ class UserService:
         Returns:
             Hexadecimal password hash
         """
-        return hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt.encode("utf-8"),
-            self.iterations
-        ).hex()
+        return hash_password(password, salt, self.iterations, self.algorithm)
+
+    def new_record(self, username: str, password: str) -> CredentialRecord:
+        """Build a credential record with a fresh salt and current parameters."""
+        salt = secrets.token_hex(self.salt_bytes)
+        return CredentialRecord(
+            username, salt, self._hash_password(password, salt), self.algorithm, self.iterations
+        )
+
+    def needs_rehash(self, record: CredentialRecord) -> bool:
+        """Check whether a record was hashed with outdated parameters."""
+        return record.iterations != self.iterations or record.algorithm != self.algorithm
 
     def _user_exists(self, username: str) -> bool:
         """
@@ -84,13 +89,9 @@ class UserService:
         Returns:
             True if user exists, False otherwise
         """
-        with self.users_file.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["username"] == username:
-                    return True
-        return False
+        return self.store.exists(username)
 
+    @timed()
     def signup(self) -> None:
         """
         Signup a new user.
@@ -111,15 +112,37 @@ class UserService:
                 "lowercase, number, and special character"
             )
 
-        salt = secrets.token_hex(self.salt_bytes)
-        pwd_hash = self._hash_password(password, salt)
-
-        with self.users_file.open("a", newline="",) as f:
-            writer = csv.writer(f)
-            writer.writerow([username, salt, pwd_hash])
+        self.store.add(self.new_record(username, password))
 
         logger.info("User registered: %s", username)
 
+    @timed()
+    def authenticate(self, username: str, password: str) -> str:
+        """
+        Verify credentials without prompting.
+
+        A record hashed with outdated parameters is rehashed with the
+        current ones after a successful verification.
+
+        Returns:
+            The authenticated username
+
+        Raises:
+            ValueError: if username or password is invalid
+        """
+        record = self.store.get(username)
+        if record is not None:
+            computed_hash = hash_password(password, record.salt, record.iterations, record.algorithm)
+            if secrets.compare_digest(computed_hash, record.password_hash):
+                if self.needs_rehash(record):
+                    self.store.update(self.new_record(username, password))
+                    logger.info("Password hash upgraded: %s", username)
+                logger.info("User authenticated: %s", username)
+                return username
+
+        raise ValueError("Invalid username or password")
+
+    @timed()
     def login(self) -> str:
         """
         Authenticate an existing user.
@@ -132,17 +155,4 @@ class UserService:
         """
         username = safe_input("Enter username: ")
         password = safe_input("Enter password: ")
-
-        with self.users_file.open(newline="",) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["username"] == username:
-                    expected_hash = row["password_hash"]
-                    salt = row["salt"]
-                    computed_hash = self._hash_password(password, salt)
-                    if secrets.compare_digest(computed_hash, expected_hash):
-                        logger.info("User authenticated: %s", username)
-                        return username
-                    break
-
-        raise ValueError("Invalid username or password")
+        return self.authenticate(username, password)
@@ -0,0 +1,324 @@
+"""
+Credential storage backends.
+
+Backends:
+- SqliteCredentialStore: indexed lookup by username (default)
+- CsvCredentialStore: legacy CSV file, scanned line by line
+
+CSV format:
+    username,salt,password_hash,algorithm,iterations
+
+Files with only the first three columns are upgraded on open; their
+rows get the legacy hash parameters from configs.security.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import logging
+
+from configs.paths import CREDENTIALS_FILE, CREDENTIALS_DB
+from configs.security import (
+    CREDENTIAL_BACKEND,
+    LEGACY_PBKDF2_ALGORITHM,
+    LEGACY_PBKDF2_ITERATIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CredentialRecord:
+    """Stored credentials of one user."""
+
+    username: str
+    salt: str
+    password_hash: str
+    algorithm: str = LEGACY_PBKDF2_ALGORITHM
+    iterations: int = LEGACY_PBKDF2_ITERATIONS
+
+
+class CredentialStore(ABC):
+    """Lookup and storage of credential records."""
+
+    @abstractmethod
+    def get(self, username: str) -> Optional[CredentialRecord]:
+        """Return the record for username, or None."""
+
+    @abstractmethod
+    def add(self, record: CredentialRecord) -> None:
+        """
+        Store a new record.
+
+        Raises:
+            ValueError: if the username already exists
+        """
+
+    @abstractmethod
+    def update(self, record: CredentialRecord) -> None:
+        """
+        Replace the stored record of an existing user.
+
+        Raises:
+            KeyError: if the username does not exist
+        """
+
+    @abstractmethod
+    def add_many(self, records: Iterable[CredentialRecord]) -> int:
+        """
+        Store many new records in one atomic write.
+
+        Records whose username already exists are skipped.
+
+        Returns:
+            Number of records stored
+        """
+
+    @abstractmethod
+    def usernames(self) -> Iterator[str]:
+        """Iterate over all stored usernames."""
+
+    def exists(self, username: str) -> bool:
+        """Check if a username already exists."""
+        return self.get(username) is not None
+
+
+class CsvCredentialStore(CredentialStore):
+    """Legacy CSV store. Every lookup scans the file."""
+
+    FIELDS = ["username", "salt", "password_hash", "algorithm", "iterations"]
+
+    def __init__(self, path: Path = CREDENTIALS_FILE):
+        self.path = Path(path)
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(self.FIELDS)
+            logger.info("Credentials file created: %s", self.path)
+        else:
+            self._upgrade_header()
+
+    def _upgrade_header(self) -> None:
+        """Rewrite a three-column file with per-row hash parameters."""
+        with self.path.open(newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header != self.FIELDS:
+            self._rewrite(list(self._rows()))
+            logger.info("Credentials file upgraded: %s", self.path)
+
+    @staticmethod
+    def _as_row(record: CredentialRecord) -> List[str]:
+        return [record.username, record.salt, record.password_hash,
+                record.algorithm, str(record.iterations)]
+
+    def _rows(self) -> Iterator[CredentialRecord]:
+        with self.path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield CredentialRecord(
+                    row["username"],
+                    row["salt"],
+                    row["password_hash"],
+                    row.get("algorithm") or LEGACY_PBKDF2_ALGORITHM,
+                    int(row.get("iterations") or LEGACY_PBKDF2_ITERATIONS),
+                )
+
+    def _rewrite(self, records: Iterable[CredentialRecord], append: bool = False) -> None:
+        """
+        Atomically replace the file, or append records to a copy of it.
+
+        Readers never see a partial write.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as out:
+                if append:
+                    with self.path.open(newline="", encoding="utf-8") as src:
+                        shutil.copyfileobj(src, out)
+                else:
+                    csv.writer(out).writerow(self.FIELDS)
+                csv.writer(out).writerows(self._as_row(r) for r in records)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, username: str) -> Optional[CredentialRecord]:
+        for record in self._rows():
+            if record.username == username:
+                return record
+        return None
+
+    def add(self, record: CredentialRecord) -> None:
+        if self.exists(record.username):
+            raise ValueError("Username already exists")
+        with self.path.open("a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(self._as_row(record))
+
+    def update(self, record: CredentialRecord) -> None:
+        records = list(self._rows())
+        for i, existing in enumerate(records):
+            if existing.username == record.username:
+                records[i] = record
+                break
+        else:
+            raise KeyError(record.username)
+        self._rewrite(records)
+
+    def add_many(self, records: Iterable[CredentialRecord]) -> int:
+        known = set(self.usernames())
+        new = []
+        for r in records:
+            if r.username not in known:
+                known.add(r.username)
+                new.append(r)
+        if new:
+            self._rewrite(new, append=True)
+        return len(new)
+
+    def usernames(self) -> Iterator[str]:
+        for record in self._rows():
+            yield record.username
+
+
+class SqliteCredentialStore(CredentialStore):
+    """SQLite store with the username as primary key (O(log n) lookup)."""
+
+    def __init__(self, path: Path = CREDENTIALS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS credentials ("
+                " username TEXT PRIMARY KEY,"
+                " salt TEXT NOT NULL,"
+                " password_hash TEXT NOT NULL,"
+                " algorithm TEXT NOT NULL,"
+                " iterations INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(credentials)")}
+            if "algorithm" not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE credentials ADD COLUMN algorithm TEXT NOT NULL "
+                    f"DEFAULT '{LEGACY_PBKDF2_ALGORITHM}'"
+                )
+            if "iterations" not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE credentials ADD COLUMN iterations INTEGER NOT NULL "
+                    f"DEFAULT {int(LEGACY_PBKDF2_ITERATIONS)}"
+                )
+
+    @staticmethod
+    def _as_params(record: CredentialRecord) -> tuple:
+        return (record.username, record.salt, record.password_hash,
+                record.algorithm, record.iterations)
+
+    def get(self, username: str) -> Optional[CredentialRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT username, salt, password_hash, algorithm, iterations"
+                " FROM credentials WHERE username = ?",
+                (username,),
+            ).fetchone()
+        return CredentialRecord(*row) if row else None
+
+    def add(self, record: CredentialRecord) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO credentials VALUES (?, ?, ?, ?, ?)",
+                    self._as_params(record),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Username already exists") from None
+
+    def update(self, record: CredentialRecord) -> None:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE credentials SET salt = ?, password_hash = ?, algorithm = ?, iterations = ?"
+                " WHERE username = ?",
+                (record.salt, record.password_hash, record.algorithm, record.iterations,
+                 record.username),
+            )
+        if cur.rowcount == 0:
+            raise KeyError(record.username)
+
+    def add_many(self, records: Iterable[CredentialRecord]) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO credentials VALUES (?, ?, ?, ?, ?)",
+                (self._as_params(r) for r in records),
+            )
+        return cur.rowcount
+
+    def usernames(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT username FROM credentials").fetchall()
+        for (username,) in rows:
+            yield username
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def migrate_csv_to_sqlite(csv_path: Path, db_path: Path) -> int:
+    """
+    Import a legacy CSV credentials file into SQLite.
+
+    The CSV is renamed to <name>.migrated afterwards so the
+    migration only runs once.
+
+    Returns:
+        Number of users imported
+    """
+    csv_path = Path(csv_path)
+    store = SqliteCredentialStore(db_path)
+    try:
+        count = store.add_many(CsvCredentialStore(csv_path)._rows())
+    finally:
+        store.close()
+    csv_path.rename(csv_path.with_name(csv_path.name + ".migrated"))
+    logger.info("Migrated %d users from %s to %s", count, csv_path, db_path)
+    return count
+
+
+def open_store(
+    backend: str = CREDENTIAL_BACKEND,
+    credentials_file: Path = CREDENTIALS_FILE,
+    credentials_db: Optional[Path] = None,
+) -> CredentialStore:
+    """
+    Open the configured credential store.
+
+    A legacy CSV file found next to a missing SQLite database is
+    migrated automatically.
+
+    Args:
+        credentials_db: SQLite database (defaults to credentials_file
+            with a .db suffix, so a custom CSV never feeds the global one)
+
+    Raises:
+        ValueError: if backend is unknown
+    """
+    if backend == "csv":
+        return CsvCredentialStore(credentials_file)
+    if backend == "sqlite":
+        if credentials_db is None:
+            credentials_db = Path(credentials_file).with_suffix(".db")
+        if Path(credentials_file).exists() and not Path(credentials_db).exists():
+            migrate_csv_to_sqlite(credentials_file, credentials_db)
+        return SqliteCredentialStore(credentials_db)
+    raise ValueError(f"Unknown credential backend: {backend}")
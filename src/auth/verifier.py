@@ -0,0 +1,181 @@
+"""
+Concurrent credential verification.
+
+Password hashes are computed on a bounded process pool so many
+simultaneous logins use all cores instead of queuing on one. Records
+hashed with outdated parameters are rehashed on the pool after a
+successful login.
+
+Usage:
+    verifier = CredentialVerifier(user_service)
+    ok = verifier.verify("alice", "secret")             # blocking
+    ok = await verifier.verify_async("alice", "secret") # asyncio
+    verifier.stats()
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Optional
+import asyncio
+import os
+import secrets
+import statistics
+import threading
+import time
+import logging
+
+from .hashing import hash_password
+from .service import UserService
+from .store import CredentialRecord
+
+logger = logging.getLogger(__name__)
+
+
+class VerifierOverloadedError(RuntimeError):
+    """Raised when the verification queue is full."""
+
+
+@dataclass(frozen=True)
+class VerifierStats:
+    """Snapshot of verifier load and latency."""
+
+    workers: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    latency_avg_ms: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+
+
+def _check_password(password: str, record: CredentialRecord) -> bool:
+    computed = hash_password(password, record.salt, record.iterations, record.algorithm)
+    return secrets.compare_digest(computed, record.password_hash)
+
+
+class CredentialVerifier:
+    """Verify credentials on a bounded process pool."""
+
+    LATENCY_WINDOW = 1000
+
+    def __init__(
+        self,
+        service: UserService,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            service: User service providing the store and hash parameters
+            max_workers: Hashing processes (defaults to CPU count)
+            max_pending: Maximum queued plus running verifications
+        """
+        self.service = service
+        self.workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 8
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    def submit(self, username: str, password: str, block: bool = True) -> "Future[bool]":
+        """
+        Start verifying a username/password pair.
+
+        Args:
+            block: Wait for a free slot instead of failing when full
+
+        Raises:
+            VerifierOverloadedError: if block is False and the queue is full
+        """
+        record = self.service.store.get(username)
+        if record is None:
+            done: Future = Future()
+            done.set_result(False)
+            return done
+
+        if not self._slots.acquire(blocking=block):
+            raise VerifierOverloadedError("Too many pending logins")
+
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(_check_password, password, record)
+        except BaseException:
+            self._finish(started)
+            raise
+        future.add_done_callback(lambda _: self._finish(started))
+        if self.service.needs_rehash(record):
+            future.add_done_callback(lambda f: self._rehash(f, username, password))
+        return future
+
+    def _rehash(self, verified: Future, username: str, password: str) -> None:
+        """Upgrade an outdated hash once its password was verified."""
+        if verified.cancelled() or verified.exception() or not verified.result():
+            return
+        salt = secrets.token_hex(self.service.salt_bytes)
+        iterations, algorithm = self.service.iterations, self.service.algorithm
+
+        def store_upgrade(hashed: Future) -> None:
+            try:
+                record = CredentialRecord(username, salt, hashed.result(), algorithm, iterations)
+                self.service.store.update(record)
+                logger.info("Password hash upgraded: %s", username)
+            except Exception:
+                logger.exception("Failed to upgrade password hash: %s", username)
+
+        try:
+            future = self._pool.submit(hash_password, password, salt, iterations, algorithm)
+            future.add_done_callback(store_upgrade)
+        except RuntimeError:
+            logger.warning("Verifier closed, hash upgrade skipped: %s", username)
+
+    def _finish(self, started: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._latencies.append((time.perf_counter() - started) * 1000)
+        self._slots.release()
+
+    def verify(self, username: str, password: str) -> bool:
+        """Verify credentials, blocking until the result is known."""
+        return self.submit(username, password).result()
+
+    async def verify_async(self, username: str, password: str) -> bool:
+        """
+        Verify credentials without blocking the event loop.
+
+        Raises:
+            VerifierOverloadedError: if the queue is full
+        """
+        return await asyncio.wrap_future(self.submit(username, password, block=False))
+
+    def stats(self) -> VerifierStats:
+        """Return current queue depth and recent verify latency."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+            completed = self._completed
+        if latencies:
+            avg = statistics.fmean(latencies)
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        else:
+            avg = p50 = p95 = 0.0
+        return VerifierStats(
+            workers=self.workers,
+            in_flight=in_flight,
+            queue_depth=max(0, in_flight - self.workers),
+            completed=completed,
+            latency_avg_ms=avg,
+            latency_p50_ms=p50,
+            latency_p95_ms=p95,
+        )
+
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        self._pool.shutdown(wait=True)
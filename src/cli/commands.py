@@ -0,0 +1,540 @@
+"""
+Non-interactive command-line interface for Notes Application.
+
+Usage:
+    python -m src.cli.commands <command> [options]
+
+Examples:
+    python -m src.cli.commands workspace list
+    python -m src.cli.commands note create "Meeting notes" -w Work
+    python -m src.cli.commands search python -w College -n Python
+    python -m src.cli.commands search "exam schedule" --ranked -k 5
+    python -m src.cli.commands search budget --timeout 2 --limit 50
+    python -m src.cli.commands search '"exam schedule" AND NOT draft' -b -w College
+    python -m src.cli.commands search 'due:\\s*\\d{4}' -r -w Work
+    python -m src.cli.commands task toggle 3,5,10-40 -w Work
+    python -m src.cli.commands note compact
+    python -m src.cli.commands note restore Meeting_notes.txt 3 -w Work
+    python -m src.cli.commands workspace export Work work.tar.gz
+    python -m src.cli.commands workspace import work.tar.gz --name Work-copy
+    python -m src.cli.commands trash list
+
+Authentication (checked in this order):
+    NOTES_TOKEN                     token from `token issue`
+    NOTES_USER and NOTES_PASSWORD   verified against the credential store
+
+Every handler imports the modules it needs itself, so a command only
+pays start-up time for the services it actually uses.
+"""
+
+from typing import Callable, Optional, Sequence
+import argparse
+import os
+import sys
+
+from configs.cli import ENV_PASSWORD, ENV_TOKEN, ENV_USER, STARTUP_BUDGET_MS
+from configs.search import RANKED_TOP_K
+
+VERSION = "1.0"
+
+
+class CommandError(Exception):
+    """Error reported to the user without a traceback."""
+
+
+# Helpers
+def _username() -> str:
+    """Authenticate from the environment and return the username."""
+    token = os.environ.get(ENV_TOKEN)
+    if token:
+        from src.auth.tokens import verify_token
+        return verify_token(token)
+
+    username = os.environ.get(ENV_USER)
+    password = os.environ.get(ENV_PASSWORD)
+    if username and password is not None:
+        from src.auth.service import UserService
+        return UserService().authenticate(username, password)
+
+    raise CommandError(f"Not authenticated: set {ENV_TOKEN} or {ENV_USER} and {ENV_PASSWORD}")
+
+
+def _user_dir(username: str):
+    from configs.paths import DATA_DIR
+    return DATA_DIR / username
+
+
+def _name(kind: str, name: str) -> str:
+    """Return a workspace or notebook name, rejecting ones that leave their parent."""
+    if not name or name.startswith(".") or "/" in name or "\\" in name or os.sep in name:
+        raise CommandError(f"Invalid {kind} name: {name!r}")
+    return name
+
+
+def _target_dir(args: argparse.Namespace):
+    """Return the workspace or notebook directory selected by -w/-n."""
+    path = _user_dir(_username()) / _name("workspace", args.workspace)
+    if not path.is_dir():
+        raise CommandError(f"Workspace not found: {args.workspace}")
+    if getattr(args, "notebook", None):
+        path = path / _name("notebook", args.notebook)
+        if not path.is_dir():
+            raise CommandError(f"Notebook not found: {args.notebook}")
+    return path
+
+
+def _paging(args: argparse.Namespace) -> dict:
+    return {"sort": args.sort, "reverse": args.reverse, "offset": args.offset, "limit": args.limit}
+
+
+# Workspaces
+def cmd_workspace_list(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    service = WorkspaceService(_user_dir(_username()))
+    for name in service.iter_workspaces(**_paging(args)):
+        print(name)
+
+
+def cmd_workspace_create(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    WorkspaceService(_user_dir(_username())).create_workspace(_name("workspace", args.name))
+
+
+def cmd_workspace_delete(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    service = WorkspaceService(_user_dir(_username()))
+    service.delete_workspace(_name("workspace", args.name))
+    # No reaper thread outlives a one-shot command; purge expired entries now
+    service.purge_deleted()
+
+
+def cmd_workspace_export(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    files = WorkspaceService(_user_dir(_username())).export_workspace(_name("workspace", args.name), args.archive)
+    print(f"{files} files exported")
+
+
+def cmd_workspace_import(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    name = _name("workspace", args.name) if args.name is not None else None
+    service = WorkspaceService(_user_dir(_username()))
+    report = service.import_workspace(args.archive, name, skip_unchanged=not args.force)
+    print(f"{report.workspace}: {report.written} files written, {report.skipped} unchanged")
+
+
+# Trash
+def cmd_trash_list(args: argparse.Namespace) -> None:
+    import time
+    from src.services.workspace_service import WorkspaceService
+    service = WorkspaceService(_user_dir(_username()))
+    service.purge_deleted()
+    for entry in service.deleted_items():
+        expires = time.strftime("%Y-%m-%d %H:%M", time.localtime(service.trash.expires_at(entry)))
+        print(f"{entry.id}\t{entry.kind}\t{entry.origin}\texpires {expires}")
+
+
+def cmd_trash_restore(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    path = WorkspaceService(_user_dir(_username())).restore_deleted(args.id)
+    print(path.name)
+
+
+def cmd_trash_purge(args: argparse.Namespace) -> None:
+    from src.services.workspace_service import WorkspaceService
+    service = WorkspaceService(_user_dir(_username()))
+    count = service.purge_deleted(args.id, expired_only=not args.all)
+    print(f"{count} entries purged")
+
+
+# Notebooks
+def cmd_notebook_list(args: argparse.Namespace) -> None:
+    from src.services.notebook_service import NotebookService
+    for name in NotebookService(_target_dir(args)).iter_notebooks(**_paging(args)):
+        print(name)
+
+
+def cmd_notebook_create(args: argparse.Namespace) -> None:
+    from src.services.notebook_service import NotebookService
+    NotebookService(_target_dir(args)).create_notebook(_name("notebook", args.name))
+
+
+def cmd_notebook_delete(args: argparse.Namespace) -> None:
+    from src.services.notebook_service import NotebookService
+    service = NotebookService(_target_dir(args))
+    service.delete_notebook(_name("notebook", args.name), force=args.force)
+    service.trash.purge()
+
+
+# Notes
+def cmd_note_list(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    for name in NoteService(_target_dir(args)).iter_notes(**_paging(args)):
+        print(name)
+
+
+def cmd_note_create(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    path = NoteService(_target_dir(args)).create_note(args.title, open_after=args.open)
+    print(path.name)
+
+
+def cmd_note_delete(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    NoteService(_target_dir(args)).delete_note(args.filename)
+
+
+def cmd_note_rename(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    path = NoteService(_target_dir(args)).rename_note(args.filename, args.title)
+    print(path.name)
+
+
+def cmd_note_info(args: argparse.Namespace) -> None:
+    import time
+    from src.services.note_service import NoteService
+    meta = NoteService(_target_dir(args)).note_info(args.filename)
+    print(f"title:    {meta.title}")
+    print(f"file:     {meta.name}")
+    print(f"size:     {meta.size}")
+    print(f"lines:    {meta.lines}")
+    print(f"modified: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta.mtime_ns / 1e9))}")
+    print(f"sha256:   {meta.sha256}")
+
+
+def cmd_note_history(args: argparse.Namespace) -> None:
+    import time
+    from src.services.note_service import NoteService
+    for v in NoteService(_target_dir(args)).note_history(args.filename):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(v.time))
+        print(f"{v.number}\t{stamp}\t{v.size}\t{v.event}\t{v.hash[:12]}")
+
+
+def cmd_note_show(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    sys.stdout.write(NoteService(_target_dir(args)).read_version(args.filename, args.version))
+
+
+def cmd_note_restore(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    path = NoteService(_target_dir(args)).restore_version(args.filename, args.version)
+    print(path.name)
+
+
+def cmd_note_compact(args: argparse.Namespace) -> None:
+    from src.services.note_service import NoteService
+    from src.utils.listing import listing_cache
+    if args.workspace is not None:
+        directories = [_target_dir(args)]
+    else:
+        # Every workspace and notebook of the user
+        user_dir = _user_dir(_username())
+        workspaces = [user_dir / name for name in listing_cache.dirs(user_dir)]
+        directories = workspaces + [ws / name for ws in workspaces for name in listing_cache.dirs(ws)]
+    compressed = before = after = 0
+    for directory in directories:
+        report = NoteService(directory).compact_notes()
+        compressed += report.compressed
+        before += report.bytes_before
+        after += report.bytes_after
+    print(f"{compressed} notes compressed, {before} -> {after} bytes")
+
+
+def cmd_search(args: argparse.Namespace) -> None:
+    if args.workspace is None:
+        _search_all(args)
+        return
+    from src.services.note_service import NoteService
+    directory = _target_dir(args)
+    service = NoteService(directory)
+    if args.regex:
+        for m in service.search_regex(args.keyword, ignore_case=not args.case_sensitive):
+            print(f"{m.path.relative_to(directory).as_posix()}:{m.line_no}:{m.line}")
+        return
+    if args.boolean:
+        for path in service.search_query(args.keyword):
+            print(path.relative_to(directory).as_posix())
+        return
+    if args.ranked:
+        for hit in service.search_ranked(args.keyword, k=args.top):
+            print(f"{hit.score:.3f}\t{hit.path.relative_to(directory).as_posix()}\t{hit.snippet}")
+        return
+    for path in service.search_notes(args.keyword):
+        print(path.relative_to(directory).as_posix())
+
+
+def _search_all(args: argparse.Namespace) -> None:
+    """Search all of the user's workspaces (search without -w)."""
+    if args.ranked or args.boolean or args.regex or args.notebook:
+        raise CommandError("--ranked, --boolean, --regex and -n need a workspace (-w)")
+    from src.services.session_manager import UserSession
+    session = UserSession(_username())
+    user_dir = session.context.user_dir
+    for path in session.search_all(args.keyword, timeout=args.timeout, limit=args.limit):
+        print(path.relative_to(user_dir).as_posix())
+
+
+# Tasks
+def cmd_task_list(args: argparse.Namespace) -> None:
+    from src.services.task_service import TaskService
+    tasks = TaskService(_target_dir(args)).iter_tasks(offset=args.offset, limit=args.limit)
+    for i, task in tasks:
+        print(f"{i}. {task}")
+
+
+def cmd_task_add(args: argparse.Namespace) -> None:
+    from src.services.task_service import TaskService
+    TaskService(_target_dir(args)).create_task(args.description)
+
+
+def _task_selection(task_service, spec: str):
+    from src.services.task_service import parse_task_selection
+    return parse_task_selection(spec, len(task_service.list_tasks()))
+
+
+def cmd_task_toggle(args: argparse.Namespace) -> None:
+    from src.services.task_service import TaskService
+    task_service = TaskService(_target_dir(args))
+    if args.selection.strip().isdigit():
+        task_service.toggle_task(int(args.selection))
+    else:
+        task_service.toggle_tasks(_task_selection(task_service, args.selection))
+
+
+def cmd_task_delete(args: argparse.Namespace) -> None:
+    from src.services.task_service import TaskService
+    task_service = TaskService(_target_dir(args))
+    if args.completed:
+        count = task_service.delete_completed()
+    elif args.selection:
+        count = task_service.delete_tasks(_task_selection(task_service, args.selection))
+    else:
+        raise CommandError("Give a task selection or --completed")
+    print(f"{count} tasks deleted")
+
+
+# Accounts
+def cmd_token_issue(args: argparse.Namespace) -> None:
+    from src.auth.service import UserService
+    from src.auth.tokens import issue_token
+
+    username = os.environ.get(ENV_USER) or input("Username: ").strip()
+    password = os.environ.get(ENV_PASSWORD)
+    if password is None:
+        import getpass
+        password = getpass.getpass("Password: ")
+    UserService().authenticate(username, password)
+    print(issue_token(username, ttl=args.ttl) if args.ttl else issue_token(username))
+
+
+def cmd_user_import(args: argparse.Namespace) -> int:
+    from src.auth.provisioning import main as provisioning_main
+    argv = [str(args.source)] + (["--workers", str(args.workers)] if args.workers else [])
+    return provisioning_main(argv)
+
+
+def cmd_calibrate(args: argparse.Namespace) -> int:
+    from src.auth.calibrate import main as calibrate_main
+    return calibrate_main(["--target-ms", str(args.target_ms)])
+
+
+# Diagnostics
+def cmd_version(args: argparse.Namespace) -> None:
+    print(VERSION)
+
+
+def cmd_startup_check(args: argparse.Namespace) -> int:
+    """Time the `version` command against the start-up budget."""
+    import statistics
+    import subprocess
+    import time
+    from configs.paths import ROOT
+
+    def median_ms(cmd: Sequence[str]) -> float:
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    baseline = median_ms([sys.executable, "-c", "pass"])
+    command = median_ms([sys.executable, "-m", "src.cli.commands", "version"])
+    print(f"interpreter: {baseline:.1f} ms")
+    print(f"command:     {command:.1f} ms (budget {args.budget_ms} ms)")
+    if command > args.budget_ms:
+        print("start-up budget exceeded", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Parser
+def _add_paging(parser: argparse.ArgumentParser, sortable: bool = True) -> argparse.ArgumentParser:
+    if sortable:
+        parser.add_argument("--sort", choices=("name", "mtime", "size"), default="name")
+        parser.add_argument("--reverse", action="store_true", help="reverse the sort order")
+    parser.add_argument("--offset", type=int, default=0, help="entries to skip")
+    parser.add_argument("--limit", type=int, default=None, help="maximum entries to print")
+    return parser
+
+
+def _add_scope(parser: argparse.ArgumentParser, notebook: bool = True, required: bool = True) -> None:
+    parser.add_argument("-w", "--workspace", required=required, help="workspace name")
+    if notebook:
+        parser.add_argument("-n", "--notebook", help="notebook inside the workspace")
+
+
+def _command(subparsers, name: str, handler: Callable, help_text: str) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(name, help=help_text)
+    parser.set_defaults(handler=handler)
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(prog="notes", description="Notes command-line interface.")
+    parser.add_argument(
+        "--metrics", metavar="FILE", default=None,
+        help="write operation metrics afterwards (.json or Prometheus text)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = _command(commands, "search", cmd_search, "search notes by name or content")
+    p.add_argument("keyword")
+    p.add_argument("--ranked", action="store_true",
+                   help="rank by relevance (BM25) and show snippets")
+    p.add_argument("-b", "--boolean", action="store_true",
+                   help='treat keyword as a query: AND, OR, NOT, "phrase", prefix*')
+    p.add_argument("-r", "--regex", action="store_true",
+                   help="treat keyword as a regular expression, print matching lines")
+    p.add_argument("--case-sensitive", action="store_true", help="case-sensitive --regex")
+    p.add_argument("-k", "--top", type=int, default=RANKED_TOP_K, help="results of a ranked search")
+    p.add_argument("--timeout", type=float, default=None,
+                   help="seconds to wait for all workspaces (without -w)")
+    p.add_argument("--limit", type=int, default=None, help="maximum results (without -w)")
+    _add_scope(p, required=False)
+
+    # workspace
+    group = commands.add_parser("workspace", help="manage workspaces").add_subparsers(
+        dest="action", required=True)
+    _add_paging(_command(group, "list", cmd_workspace_list, "list workspaces"))
+    _command(group, "create", cmd_workspace_create, "create a workspace").add_argument("name")
+    _command(group, "delete", cmd_workspace_delete, "delete a workspace").add_argument("name")
+    p = _command(group, "export", cmd_workspace_export, "write a workspace to a .tar.gz archive")
+    p.add_argument("name")
+    p.add_argument("archive")
+    p = _command(group, "import", cmd_workspace_import, "restore a workspace from an archive")
+    p.add_argument("archive")
+    p.add_argument("--name", default=None, help="workspace to restore into (default: as archived)")
+    p.add_argument("--force", action="store_true", help="rewrite files that are already identical")
+
+    # trash
+    group = commands.add_parser("trash", help="deleted workspaces and notebooks").add_subparsers(
+        dest="action", required=True)
+    _command(group, "list", cmd_trash_list, "list restorable deletions")
+    _command(group, "restore", cmd_trash_restore, "undo a deletion").add_argument("id")
+    p = _command(group, "purge", cmd_trash_purge, "free the space of expired deletions now")
+    p.add_argument("id", nargs="?", help="purge only this entry")
+    p.add_argument("--all", action="store_true", help="purge everything, expired or not")
+
+    # notebook
+    group = commands.add_parser("notebook", help="manage notebooks").add_subparsers(
+        dest="action", required=True)
+    p = _add_paging(_command(group, "list", cmd_notebook_list, "list notebooks"))
+    _add_scope(p, notebook=False)
+    p = _command(group, "create", cmd_notebook_create, "create a notebook")
+    p.add_argument("name")
+    _add_scope(p, notebook=False)
+    p = _command(group, "delete", cmd_notebook_delete, "delete a notebook")
+    p.add_argument("name")
+    p.add_argument("--force", action="store_true", help="delete even if not empty")
+    _add_scope(p, notebook=False)
+
+    # note
+    group = commands.add_parser("note", help="manage notes").add_subparsers(
+        dest="action", required=True)
+    _add_scope(_add_paging(_command(group, "list", cmd_note_list, "list notes")))
+    p = _command(group, "create", cmd_note_create, "create a note")
+    p.add_argument("title")
+    p.add_argument("--open", action="store_true", help="open the note in the default editor")
+    _add_scope(p)
+    p = _command(group, "delete", cmd_note_delete, "delete a note")
+    p.add_argument("filename")
+    _add_scope(p)
+    p = _command(group, "rename", cmd_note_rename, "rename a note")
+    p.add_argument("filename")
+    p.add_argument("title")
+    _add_scope(p)
+    p = _command(group, "info", cmd_note_info, "show a note's size, line count and hash")
+    p.add_argument("filename")
+    _add_scope(p)
+    p = _command(group, "history", cmd_note_history, "list recorded versions of a note")
+    p.add_argument("filename")
+    _add_scope(p)
+    for name, handler, help_text in (
+        ("show", cmd_note_show, "print one version of a note"),
+        ("restore", cmd_note_restore, "make a version the current note"),
+    ):
+        p = _command(group, name, handler, help_text)
+        p.add_argument("filename")
+        p.add_argument("version", type=int)
+        _add_scope(p)
+    _add_scope(_command(group, "compact", cmd_note_compact,
+                        "compress large or cold notes (all workspaces without -w)"), required=False)
+
+    # task
+    group = commands.add_parser("task", help="manage tasks").add_subparsers(
+        dest="action", required=True)
+    _add_scope(_add_paging(_command(group, "list", cmd_task_list, "list tasks"), sortable=False))
+    p = _command(group, "add", cmd_task_add, "add a task")
+    p.add_argument("description")
+    _add_scope(p)
+    p = _command(group, "toggle", cmd_task_toggle, "toggle task checkboxes")
+    p.add_argument("selection", help='task numbers, e.g. "3,5,10-40"')
+    _add_scope(p)
+    p = _command(group, "delete", cmd_task_delete, "delete tasks")
+    p.add_argument("selection", nargs="?", help='task numbers, e.g. "3,5,10-40"')
+    p.add_argument("--completed", action="store_true", help="delete all completed tasks")
+    _add_scope(p)
+
+    # accounts
+    group = commands.add_parser("token", help="access tokens").add_subparsers(
+        dest="action", required=True)
+    p = _command(group, "issue", cmd_token_issue, f"print a token for {ENV_TOKEN}")
+    p.add_argument("--ttl", type=int, default=None, help="lifetime in seconds")
+
+    group = commands.add_parser("user", help="manage users").add_subparsers(
+        dest="action", required=True)
+    p = _command(group, "import", cmd_user_import, "bulk-create users from CSV or JSONL")
+    p.add_argument("source")
+    p.add_argument("--workers", type=int, default=None, help="hashing processes")
+
+    p = _command(commands, "calibrate", cmd_calibrate, "recommend PBKDF2 iterations")
+    p.add_argument("--target-ms", type=float, default=100.0, help="target hash latency")
+
+    # diagnostics
+    _command(commands, "version", cmd_version, "print the version")
+    p = _command(commands, "startup-check", cmd_startup_check, "measure command start-up time")
+    p.add_argument("--runs", type=int, default=10, help="timed runs")
+    p.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="allowed median")
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run one command and return its exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        status = args.handler(args)
+    except (CommandError, ValueError, IndexError, FileNotFoundError, FileExistsError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        status = 1
+    finally:
+        if args.metrics:
+            from pathlib import Path
+            from src.utils.metrics import metrics
+            metrics.write(Path(args.metrics))
+    return status or 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
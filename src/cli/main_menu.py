@@ -1,15 +1,13 @@
-import logging
 from src.utils.helpers import safe_input
-
-logger = logging.getLogger("notes.app")
+from src.utils.console import echo
 
 
 def main_menu() -> int:
     """Main menu."""
-    logger.info("\n===== NOTES APP =====")
-    logger.info("1. Signup")
-    logger.info("2. Login")
-    logger.info("3. Exit")
+    echo("\n===== NOTES APP =====")
+    echo("1. Signup")
+    echo("2. Login")
+    echo("3. Exit")
 
     try:
         return int(safe_input("Enter choice: "))
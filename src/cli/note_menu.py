@@ -1,23 +1,29 @@
 """
 Note menu CLI for Notes Application.
 """
-import logging
 
-from src.utils.helpers import safe_input
+import time
 
-logger = logging.getLogger("notes.app")
+from src.utils.helpers import safe_input
+from src.utils.console import echo, echo_error
+from src.cli.paging import show_paged
+from src.cli.prompts import ask_name
 
 
 def _note_menu() -> int:
     """Display notes menu."""
-    logger.info("\n--- NOTES ---")
-    logger.info("1. Create note")
-    logger.info("2. List notes")
-    logger.info("3. Open note")
-    logger.info("4. Delete note")
-    logger.info("5. Rename note")
-    logger.info("6. Search notes")
-    logger.info("7. Back")
+    echo("\n--- NOTES ---")
+    echo("1. Create note")
+    echo("2. List notes")
+    echo("3. Open note")
+    echo("4. Delete note")
+    echo("5. Rename note")
+    echo("6. Search notes")
+    echo("7. Ranked search")
+    echo("8. Advanced search (AND, OR, NOT, \"phrase\", prefix*)")
+    echo("9. Regex search")
+    echo("10. Note history")
+    echo("11. Back")
     try:
         return int(safe_input("Enter choice: "))
     except ValueError:
@@ -28,7 +34,7 @@ def _ensure_notes_exist(note_service) -> bool:
     """Check whether notes exist."""
     notes = note_service.list_notes()
     if not notes:
-        logger.info("No notes found. Create a note first.")
+        echo("No notes found. Create a note first.")
         return False
     return True
 
@@ -43,51 +49,53 @@ def note_menu(note_service):
             title = safe_input("Note title: ")
             try:
                 note_service.create_note(title)
-                logger.info("Note created: %s", title)
+                echo("Note created: %s", title)
             except Exception as exc:
-                logger.error("Failed to create note: %s", exc)
+                echo_error("Failed to create note: %s", exc)
 
         # List notes
         elif choice == 2:
-            notes = note_service.list_notes()
-            if not notes:
-                logger.info("No notes found")
-            else:
-                for n in notes:
-                    logger.info(n)
+            if not show_paged(note_service.iter_notes()):
+                echo("No notes found")
 
         # Open note
         elif choice == 3:
             if not _ensure_notes_exist(note_service):
                 continue
-            filename = safe_input("Open note: ")
+            filename = ask_name("Open note: ", note_service.suggest_notes)
+            if filename is None:
+                continue
             try:
                 note_service.open_note(filename)
             except Exception as exc:
-                logger.error("Failed to open note: %s", exc)
+                echo_error("Failed to open note: %s", exc)
 
         # Delete note
         elif choice == 4:
             if not _ensure_notes_exist(note_service):
                 continue
-            filename = safe_input("Delete note: ")
+            filename = ask_name("Delete note: ", note_service.suggest_notes)
+            if filename is None:
+                continue
             try:
                 note_service.delete_note(filename)
-                logger.info("Note deleted: %s", filename)
+                echo("Note deleted: %s", filename)
             except Exception as exc:
-                logger.error("Failed to delete note: %s", exc)
+                echo_error("Failed to delete note: %s", exc)
 
         # Rename note
         elif choice == 5:
             if not _ensure_notes_exist(note_service):
                 continue
-            old_name = safe_input("Old note name: ")
+            old_name = ask_name("Old note name: ", note_service.suggest_notes)
+            if old_name is None:
+                continue
             new_name = safe_input("New note title: ")
             try:
                 note_service.rename_note(old_name, new_name)
-                logger.info("Note renamed to: %s", new_name)
+                echo("Note renamed to: %s", new_name)
             except Exception as exc:
-                logger.error("Failed to rename note: %s", exc)
+                echo_error("Failed to rename note: %s", exc)
 
         # Search notes
         elif choice == 6:
@@ -96,13 +104,79 @@ def note_menu(note_service):
             keyword = safe_input("Search keyword: ")
             results = note_service.search_notes(keyword)
             if not results:
-                logger.info("No matching notes found")
+                echo("No matching notes found")
             else:
                 for r in results:
-                    logger.info(r.name)
+                    echo(r.name)
 
+        # Ranked search
         elif choice == 7:
+            if not _ensure_notes_exist(note_service):
+                continue
+            query = safe_input("Search query: ")
+            hits = note_service.search_ranked(query)
+            if not hits:
+                echo("No matching notes found")
+            for i, hit in enumerate(hits, 1):
+                echo("%d. %s (%.2f)", i, hit.path.name, hit.score)
+                if hit.snippet:
+                    echo("   %s", hit.snippet)
+
+        # Boolean / phrase search
+        elif choice == 8:
+            if not _ensure_notes_exist(note_service):
+                continue
+            query = safe_input("Query: ")
+            try:
+                results = note_service.search_query(query)
+            except ValueError as exc:
+                echo_error("Invalid query: %s", exc)
+                continue
+            if not show_paged(r.name for r in results):
+                echo("No matching notes found")
+
+        # Regex search
+        elif choice == 9:
+            if not _ensure_notes_exist(note_service):
+                continue
+            pattern = safe_input("Pattern: ")
+            try:
+                matches = note_service.search_regex(pattern)
+            except ValueError as exc:
+                echo_error("%s", exc)
+                continue
+            if not show_paged(f"{m.path.name}:{m.line_no}: {m.line}" for m in matches):
+                echo("No matching notes found")
+
+        # Version history
+        elif choice == 10:
+            filename = ask_name("Note: ", note_service.suggest_notes)
+            if filename is None:
+                continue
+            try:
+                versions = note_service.note_history(filename)
+            except ValueError as exc:
+                echo_error("Failed to read history: %s", exc)
+                continue
+            if not versions:
+                echo("No history recorded for this note")
+                continue
+            show_paged(
+                f"{v.number}. {time.strftime('%Y-%m-%d %H:%M', time.localtime(v.time))}"
+                f"  {v.size} bytes  ({v.event})"
+                for v in versions
+            )
+            number = safe_input("Version to restore (Enter to skip): ")
+            if not number:
+                continue
+            try:
+                path = note_service.restore_version(filename, int(number))
+                echo("Note restored: %s", path.name)
+            except (ValueError, OSError) as exc:
+                echo_error("Failed to restore note: %s", exc)
+
+        elif choice == 11:
             break
 
         else:
-            logger.error("Invalid choice")
+            echo_error("Invalid choice")
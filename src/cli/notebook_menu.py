@@ -1,22 +1,22 @@
 """
 Workspace menu CLI for Notes Application.
 """
-import logging
 
 from src.utils.helpers import safe_input
+from src.utils.console import echo, echo_error
+from src.cli.paging import show_paged
+from src.cli.prompts import ask_name
 from src.cli.note_menu import note_menu
 from src.cli.task_menu import task_menu
 
-logger = logging.getLogger("notes.app")
-
 
 def _notebook_menu() -> int:
-    logger.info("\n--- NOTEBOOK ---")
-    logger.info("1. Create notebook")
-    logger.info("2. List notebooks")
-    logger.info("3. Delete notebook")
-    logger.info("4. Open notebook")
-    logger.info("5. Back")
+    echo("\n--- NOTEBOOK ---")
+    echo("1. Create notebook")
+    echo("2. List notebooks")
+    echo("3. Delete notebook")
+    echo("4. Open notebook")
+    echo("5. Back")
     try:
         return int(safe_input("Enter choice: "))
     except ValueError:
@@ -33,71 +33,65 @@ def notebook_menu(notebook_svc):
             name = safe_input("Notebook name: ").strip()
             try:
                 notebook_svc.create_notebook(name)
-                logger.info("Notebook created: %s", name)
+                echo("Notebook created: %s", name)
             except Exception as exc:
-                logger.error("Failed to create notebook: %s", exc)
+                echo_error("Failed to create notebook: %s", exc)
 
         # LIST
         elif choice == 2:
-            notebooks = notebook_svc.list_notebooks()
-            if not notebooks:
-                logger.info("No notebooks found")
-            else:
-                for notebook in notebooks:
-                    logger.info(notebook)
+            if not show_paged(notebook_svc.iter_notebooks()):
+                echo("No notebooks found")
 
         # DELETE
         elif choice == 3:
             notebooks = notebook_svc.list_notebooks()
             if not notebooks:
-                logger.info("No notebooks found. Create one first.")
+                echo("No notebooks found. Create one first.")
                 continue
 
-            logger.info("Available notebooks:")
-            for notebook in notebooks:
-                logger.info(notebook)
+            echo("Available notebooks:")
+            show_paged(notebooks)
 
-            name = safe_input("Notebook to delete: ").strip()
+            name = ask_name("Notebook to delete: ", notebook_svc.suggest_notebooks)
             if name not in notebooks:
-                logger.error("Notebook not found")
+                echo_error("Notebook not found")
                 continue
 
 
             confirm = safe_input("Are you sure to delete? (y/n): ").lower()
             if confirm != "y":
-                logger.info("Delete cancelled")
+                echo("Delete cancelled")
                 continue
 
             try:
                 notebook_svc.delete_notebook(name)
-                logger.info("Notebook deleted: %s", name)
+                echo("Notebook deleted: %s", name)
             except Exception as exc:
-                logger.error("Failed to delete notebook: %s", exc)
+                echo_error("Failed to delete notebook: %s", exc)
 
         # OPEN
         elif choice == 4:
             notebooks = notebook_svc.list_notebooks()
             if not notebooks:
-                logger.info("No notebooks found. Create one first.")
+                echo("No notebooks found. Create one first.")
                 continue
 
-            logger.info("Available notebooks:")
-            for notebook in notebooks:
-                logger.info(notebook)
+            echo("Available notebooks:")
+            show_paged(notebooks)
 
-            notebook_name = safe_input("Open notebook: ").strip()
+            notebook_name = ask_name("Open notebook: ", notebook_svc.suggest_notebooks)
             if notebook_name not in notebooks:
-                logger.error("Notebook not found")
+                echo_error("Notebook not found")
                 continue
 
             note_svc_notebook = notebook_svc.note_service_for(notebook_name)
             task_svc_notebook = notebook_svc.task_service_for(notebook_name)
 
             while True:
-                logger.info("\n--- NOTEBOOK CONTENT ---")
-                logger.info("1. Notes")
-                logger.info("2. Tasks")
-                logger.info("3. Back")
+                echo("\n--- NOTEBOOK CONTENT ---")
+                echo("1. Notes")
+                echo("2. Tasks")
+                echo("3. Back")
                 try:
                     notebook_choice = int(safe_input("Enter choice: "))
                 except ValueError:
@@ -110,10 +104,10 @@ def notebook_menu(notebook_svc):
                 elif notebook_choice == 3:
                     break
                 else:
-                    logger.error("Invalid choice")
+                    echo_error("Invalid choice")
 
         elif choice == 5:
             break
 
         else:
-            logger.error("Invalid choice")
+            echo_error("Invalid choice")
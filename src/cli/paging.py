@@ -0,0 +1,33 @@
+"""
+Paged output for menu listings.
+"""
+
+from itertools import islice
+from typing import Iterable
+
+from src.utils.helpers import safe_input
+from src.utils.console import echo
+from configs.cli import PAGE_SIZE
+
+
+def show_paged(lines: Iterable[str], page_size: int = PAGE_SIZE) -> int:
+    """
+    Show lines one page at a time, asking before each further page.
+
+    Lines are pulled lazily, so output starts before a large listing
+    has been fully produced.
+
+    Returns:
+        Number of lines shown
+    """
+    it = iter(lines)
+    shown = 0
+    page = list(islice(it, page_size))
+    while page:
+        for line in page:
+            echo(line)
+        shown += len(page)
+        page = list(islice(it, page_size))
+        if page and safe_input("-- more (Enter), q to stop -- ").lower() == "q":
+            break
+    return shown
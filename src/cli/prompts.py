@@ -0,0 +1,41 @@
+"""
+Name prompts with suggestions for menus.
+"""
+
+from typing import Callable, List, Optional
+
+from src.utils.helpers import safe_input
+from src.utils.console import echo, echo_error
+
+
+def ask_name(prompt: str, suggest: Callable[[str], List[str]]) -> Optional[str]:
+    """
+    Ask for an existing entry's name, offering close matches.
+
+    When what was typed is not an exact name, the matches found by
+    suggest (substring or typo-tolerant) are listed to pick from.
+
+    Returns:
+        The typed or picked name, or None if nothing was chosen
+    """
+    entered = safe_input(prompt)
+    if not entered:
+        return None
+    matches = suggest(entered)
+    if not matches or matches[0] == entered:
+        return entered
+
+    echo("Did you mean:")
+    for i, name in enumerate(matches, 1):
+        echo("  %d. %s", i, name)
+    choice = safe_input("Choose a number (Enter to keep what you typed): ")
+    if not choice:
+        return entered
+    try:
+        index = int(choice) - 1
+        if index < 0:
+            raise IndexError
+        return matches[index]
+    except (ValueError, IndexError):
+        echo_error("Invalid choice")
+        return None
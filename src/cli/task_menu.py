@@ -2,21 +2,22 @@
 Task menu CLI for Notes Application.
 """
 
-import logging
 
 from src.utils.helpers import safe_input
-
-logger = logging.getLogger("notes.app")
+from src.utils.console import echo, echo_error
+from src.cli.paging import show_paged
+from src.services.task_service import parse_task_selection
 
 
 def _task_menu() -> int:
-    logger.info("\n--- TASKS ---")
-    logger.info("1. Create task")
-    logger.info("2. List tasks")
-    logger.info("3. Open task file")
-    logger.info("4. Toggle task checkbox")
-    logger.info("5. Delete task")
-    logger.info("6. Back")
+    echo("\n--- TASKS ---")
+    echo("1. Create task")
+    echo("2. List tasks")
+    echo("3. Open task file")
+    echo("4. Toggle task checkbox")
+    echo("5. Delete task")
+    echo("6. Delete completed tasks")
+    echo("7. Back")
     try:
         return int(safe_input("Enter choice: "))
     except ValueError:
@@ -26,14 +27,13 @@ def _task_menu() -> int:
 def _ensure_tasks_exist(task_service) -> bool:
     tasks = task_service.list_tasks()
     if not tasks:
-        logger.info("No tasks found. Create a task first.")
+        echo("No tasks found. Create a task first.")
         return False
     return True
 
-def _print_tasks(task_service) -> None:
-    tasks=task_service.list_tasks()
-    for i, task in enumerate(tasks, start=1):
-        logger.info(f"{i}. {task}")
+def _print_tasks(task_service) -> int:
+    show_paged(f"{i}. {task}" for i, task in task_service.iter_tasks())
+    return len(task_service.list_tasks())
 
 
 def task_menu(task_service):
@@ -46,50 +46,63 @@ def task_menu(task_service):
             try:
                 task_service.create_task(task)
             except Exception as exc:
-                logger.error("Failed to create task: %s", exc)
+                echo_error("Failed to create task: %s", exc)
 
         # List tasks
         elif choice == 2:
-            tasks = task_service.list_tasks()
-            if not tasks:
-                logger.info("No tasks found")
-            else:
-                for i, t in enumerate(tasks, start=1):
-                    logger.info("%d. %s", i, t)
+            if not show_paged(f"{i}. {t}" for i, t in task_service.iter_tasks()):
+                echo("No tasks found")
 
         # Open task file
         elif choice == 3:
             try:
                 task_service.open_task_file()
             except Exception as exc:
-                logger.error("Failed to open task file: %s", exc)
+                echo_error("Failed to open task file: %s", exc)
 
         # Toggle task
         elif choice == 4:
             if not _ensure_tasks_exist(task_service):
                 continue
             try:
-                _print_tasks(task_service)                
-                index = int(safe_input("Task number to toggle: "))
-                task_service.toggle_task(index)
-                logger.info("Task updated")
+                total = _print_tasks(task_service)
+                indices = parse_task_selection(
+                    safe_input("Task numbers to toggle (e.g. 3,5,10-40): "), total
+                )
+                if len(indices) == 1:
+                    task_service.toggle_task(indices.pop())
+                else:
+                    task_service.toggle_tasks(indices)
+                echo("Task updated")
             except Exception as exc:
-                logger.error("Failed to toggle task: %s", exc)
+                echo_error("Failed to toggle task: %s", exc)
 
         # Delete task
         elif choice == 5:
             if not _ensure_tasks_exist(task_service):
                 continue
             try:
-                _print_tasks(task_service)
-                index = int(safe_input("Task number to delete: "))
-                task_service.delete_task(index)
-                logger.info("Task deleted")
+                total = _print_tasks(task_service)
+                indices = parse_task_selection(
+                    safe_input("Task numbers to delete (e.g. 3,5,10-40): "), total
+                )
+                count = task_service.delete_tasks(indices)
+                echo("Tasks deleted: %d", count)
             except Exception as exc:
-                logger.error("Failed to delete task: %s", exc)
+                echo_error("Failed to delete task: %s", exc)
 
+        # Delete completed tasks
         elif choice == 6:
+            if not _ensure_tasks_exist(task_service):
+                continue
+            try:
+                count = task_service.delete_completed()
+                echo("Completed tasks deleted: %d", count)
+            except Exception as exc:
+                echo_error("Failed to delete tasks: %s", exc)
+
+        elif choice == 7:
             break
 
         else:
-            logger.error("Invalid choice")
+            echo_error("Invalid choice")
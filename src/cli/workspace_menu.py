@@ -2,8 +2,8 @@
 Workspace menu for Notes Application.
 """
 
-import logging
 from pathlib import Path
+import time
 
 from src.services.session_manager import UserSession
 
@@ -11,17 +11,22 @@ from src.cli.notebook_menu import notebook_menu
 from src.cli.note_menu import note_menu
 from src.cli.task_menu import task_menu
 from src.utils.helpers import safe_input
+from src.utils.console import echo, echo_error
+from src.cli.paging import show_paged
+from src.cli.prompts import ask_name
+from configs.search import USER_SEARCH_TIMEOUT
 
-logger = logging.getLogger("notes.app")
 
 def _workspace_menu() -> int:
 
-    logger.info("\n--- WORKSPACES ---")
-    logger.info("1. Create workspace")
-    logger.info("2. List workspaces")
-    logger.info("3. Select workspace")
-    logger.info("4. Delete workspace")
-    logger.info("5. Logout")
+    echo("\n--- WORKSPACES ---")
+    echo("1. Create workspace")
+    echo("2. List workspaces")
+    echo("3. Select workspace")
+    echo("4. Delete workspace")
+    echo("5. Search all workspaces")
+    echo("6. Restore deleted")
+    echo("7. Logout")
 
     try:
         return int(safe_input("\nEnter choice: "))
@@ -30,9 +35,9 @@ def _workspace_menu() -> int:
 
 def workspace_menu(username: str) -> None:
     """Main workspace menu loop."""
+    session = UserSession(username)
+    session.start_trash_reaper()
     while True:
-        session = UserSession(username)
-
         choice = _workspace_menu()
 
         # CREATE WORKSPACE
@@ -40,35 +45,35 @@ def workspace_menu(username: str) -> None:
             name = safe_input("Workspace name: ").strip()
             try:
                 session.create_workspace(name)
-                logger.info("Workspace created: %s", name)
+                echo("Workspace created: %s", name)
             except Exception as exc:
-                logger.error("Failed to create workspace: %s", exc)
+                echo_error("Failed to create workspace: %s", exc)
 
         # LIST WORKSPACES
         elif choice == 2:
             workspaces = session.list_workspaces()
             if not workspaces:
-                logger.info("No workspaces found")
+                echo("No workspaces found")
             else:
-                logger.info("Available workspaces:")
-                for i, ws in enumerate(workspaces, 1):
-                    logger.info("%d. %s", i, ws)
+                echo("Available workspaces:")
+                show_paged(f"{i}. {ws}" for i, ws in enumerate(workspaces, 1))
 
         # SELECT WORKSPACE
         elif choice == 3:
             workspaces = session.list_workspaces()
             if not workspaces:
-                logger.info("No workspaces found. Create one first.")
+                echo("No workspaces found. Create one first.")
                 continue
             
-            logger.info("Available workspaces:")
-            for i, ws in enumerate(workspaces, 1):
-                logger.info("%d. %s", i, ws)
+            echo("Available workspaces:")
+            show_paged(f"{i}. {ws}" for i, ws in enumerate(workspaces, 1))
 
-            workspace_name = safe_input("Enter workspace name to select: ").strip()
+            workspace_name = ask_name("Enter workspace name to select: ", session.suggest_workspaces)
+            if workspace_name is None:
+                continue
             ws_path = Path(session.context.user_dir) / workspace_name
             if not ws_path.exists():
-                logger.error("Workspace not found")
+                echo_error("Workspace not found")
                 continue
                 
             # Initialize services for this workspace
@@ -78,15 +83,15 @@ def workspace_menu(username: str) -> None:
 
             # Workspace content menu
             while True:
-                logger.info("\n--- WORKSPACE CONTENT ---")
-                logger.info("1. Manage Notebooks")
-                logger.info("2. Manage Notes")
-                logger.info("3. Manage Tasks")
-                logger.info("4. Back")
+                echo("\n--- WORKSPACE CONTENT ---")
+                echo("1. Manage Notebooks")
+                echo("2. Manage Notes")
+                echo("3. Manage Tasks")
+                echo("4. Back")
                 try:
                     content_choice = int(safe_input("Enter choice: "))
                 except ValueError:
-                    logger.error("Invalid input. Enter a number.")
+                    echo_error("Invalid input. Enter a number.")
                     continue
 
                 if content_choice == 1:
@@ -98,29 +103,61 @@ def workspace_menu(username: str) -> None:
                 elif content_choice == 4:
                     break
                 else:
-                    logger.error("Invalid choice")
+                    echo_error("Invalid choice")
 
         # DELETE WORKSPACE
         elif choice == 4:
             workspaces = session.list_workspaces()
             if not workspaces:
-                logger.info("No workspaces found to delete")
+                echo("No workspaces found to delete")
                 continue
 
-            logger.info("Available workspaces:")
-            for i, ws in enumerate(workspaces, 1):
-                logger.info("%d. %s", i, ws)
-                name = safe_input("Workspace to delete: ").strip()
-                try:
-                    session.delete_workspace(name)
-                    logger.info("Workspace deleted: %s", name)
-                except Exception as exc:
-                    logger.error("Failed to delete workspace: %s", exc)
+            echo("Available workspaces:")
+            show_paged(f"{i}. {ws}" for i, ws in enumerate(workspaces, 1))
+            name = ask_name("Workspace to delete: ", session.suggest_workspaces)
+            if name is None:
+                continue
+            try:
+                session.delete_workspace(name)
+                echo("Workspace deleted: %s", name)
+            except Exception as exc:
+                echo_error("Failed to delete workspace: %s", exc)
 
-        # LOGOUT
+        # SEARCH ALL WORKSPACES
         elif choice == 5:
-            logger.info("Logged out")
+            keyword = safe_input("Search keyword: ")
+            user_dir = session.context.user_dir
+            results = session.search_all(keyword, timeout=USER_SEARCH_TIMEOUT)
+            if not show_paged(p.relative_to(user_dir).as_posix() for p in results):
+                echo("No matching notes found")
+
+        # RESTORE DELETED WORKSPACE OR NOTEBOOK
+        elif choice == 6:
+            deleted = session.deleted_items()
+            if not deleted:
+                echo("Trash is empty")
+                continue
+            show_paged(
+                f"{i}. {entry.origin} ({entry.kind})"
+                f"  deleted {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.deleted_at))}"
+                for i, entry in enumerate(deleted, 1)
+            )
+            number = safe_input("Number to restore (Enter to skip): ")
+            if not number:
+                continue
+            try:
+                entry = deleted[int(number) - 1]
+                session.restore_deleted(entry.id)
+                echo("Restored: %s", entry.origin)
+            except (ValueError, IndexError):
+                echo_error("Invalid choice")
+            except OSError as exc:
+                echo_error("Failed to restore: %s", exc)
+
+        # LOGOUT
+        elif choice == 7:
+            echo("Logged out")
             break
 
         else:
-            logger.error("Invalid choice")
+            echo_error("Invalid choice")
@@ -0,0 +1,246 @@
+"""
+Streaming workspace archives.
+
+An archive is a tar stream of the workspace directory (notes, notebooks,
+task lists; hidden files such as search indexes and history are left
+out), compressed as a multi-member gzip file: the stream is cut into
+blocks that are compressed in parallel and written in order. Any gzip
+reader (gzip.open, `tar -xzf`) reads it as one file.
+
+Every file member carries its SHA-256 in a pax header, which import
+uses both to verify what it writes and to skip files that are already
+identical on disk.
+
+Memory stays bounded by the block size times the number of blocks in
+flight, whatever the size of the workspace.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Deque, Iterator, Optional
+import gzip
+import hashlib
+import os
+import tarfile
+import tempfile
+import logging
+
+from configs.storage import ARCHIVE_BLOCK_BYTES, ARCHIVE_WORKERS, COMPRESS_LEVEL
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_HEADER = "NOTES.sha256"
+_READ_CHUNK = 1 << 20
+
+
+class ArchiveError(ValueError):
+    """Raised when an archive is malformed or fails verification."""
+
+
+@dataclass
+class ImportReport:
+    """Result of importing an archive."""
+
+    workspace: str
+    written: int = 0
+    skipped: int = 0
+    bytes_written: int = 0
+
+
+class ParallelGzipWriter:
+    """File-like writer compressing fixed-size blocks on a thread pool."""
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        level: int = COMPRESS_LEVEL,
+        block_size: int = ARCHIVE_BLOCK_BYTES,
+        workers: int = ARCHIVE_WORKERS,
+    ):
+        self.fileobj = fileobj
+        self.level = level
+        self.block_size = block_size
+        self.max_pending = workers * 2
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gzip")
+        self._pending: Deque[Future] = deque()
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def _submit(self, block: bytes) -> None:
+        # zlib releases the GIL, so blocks compress concurrently
+        self._pending.append(self._pool.submit(gzip.compress, block, self.level, mtime=0))
+        while len(self._pending) > self.max_pending:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        """Compress what is buffered and write all remaining blocks."""
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            self._pool.shutdown(wait=True)
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk(directory: Path) -> Iterator[Path]:
+    """Yield visible files and directories below directory, parents first."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield Path(entry.path)
+                stack.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                yield Path(entry.path)
+
+
+def export_directory(
+    directory: Path,
+    dest: BinaryIO,
+    arcname: str,
+    level: int = COMPRESS_LEVEL,
+    workers: int = ARCHIVE_WORKERS,
+) -> int:
+    """
+    Stream directory into dest as a compressed archive rooted at arcname.
+
+    Returns:
+        Number of files archived
+    """
+    writer = ParallelGzipWriter(dest, level=level, workers=workers)
+    files = 0
+    try:
+        with tarfile.open(fileobj=writer, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+            tar.add(directory, arcname=arcname, recursive=False)
+            for path in _walk(directory):
+                name = f"{arcname}/{path.relative_to(directory).as_posix()}"
+                info = tar.gettarinfo(str(path), arcname=name)
+                if info.isdir():
+                    tar.addfile(info)
+                    continue
+                info.pax_headers = {CHECKSUM_HEADER: _sha256_file(path)}
+                with open(path, "rb") as f:
+                    tar.addfile(info, f)
+                files += 1
+    finally:
+        writer.close()
+    return files
+
+
+def _workspace_name(name: str) -> str:
+    """Return the workspace an archive is restored into, rejecting hidden or unsafe names."""
+    if not name or name.startswith(".") or "/" in name or "\\" in name or os.sep in name:
+        raise ArchiveError(f"Invalid workspace name: {name!r}")
+    return name
+
+
+def _member_path(member: tarfile.TarInfo, root: str) -> PurePosixPath:
+    """Return a member's path below the archive root, rejecting unsafe ones."""
+    path = PurePosixPath(member.name)
+    if path.is_absolute() or ".." in path.parts or path.parts[:1] != (root,):
+        raise ArchiveError(f"Unsafe path in archive: {member.name}")
+    if not (member.isfile() or member.isdir()):
+        raise ArchiveError(f"Unsupported archive member: {member.name}")
+    if member.isfile() and len(path.parts) == 1:
+        raise ArchiveError(f"Archive root is a file: {member.name}")
+    return PurePosixPath(*path.parts[1:])
+
+
+def _unchanged(target: Path, member: tarfile.TarInfo, checksum: str) -> bool:
+    try:
+        if target.stat().st_size != member.size:
+            return False
+        return _sha256_file(target) == checksum
+    except FileNotFoundError:
+        return False
+
+
+def _extract(tar: tarfile.TarFile, member: tarfile.TarInfo, target: Path, checksum: Optional[str]) -> None:
+    """Write a member to target atomically, verifying its checksum."""
+    source = tar.extractfile(member)
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: source.read(_READ_CHUNK), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        if checksum is not None and digest.hexdigest() != checksum:
+            raise ArchiveError(f"Checksum mismatch: {member.name}")
+        os.utime(tmp, (member.mtime, member.mtime))
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def import_archive(
+    source: BinaryIO,
+    parent: Path,
+    name: Optional[str] = None,
+    skip_unchanged: bool = True,
+) -> ImportReport:
+    """
+    Restore an archive below parent, streaming it member by member.
+
+    Args:
+        name: Directory to restore into (defaults to the archive's root)
+        skip_unchanged: Leave files whose content already matches alone
+
+    Raises:
+        ArchiveError: if the archive is unsafe, malformed or corrupt
+    """
+    report: Optional[ImportReport] = None
+    try:
+        with gzip.open(source, "rb") as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+            root = None
+            for member in tar:
+                if root is None:
+                    # Checked before anything is created
+                    root = (PurePosixPath(member.name).parts or ("",))[0]
+                    report = ImportReport(workspace=_workspace_name(name or root))
+                    target_root = parent / report.workspace
+                rel = _member_path(member, root)
+                target = target_root.joinpath(*rel.parts)
+                if member.isdir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                checksum = member.pax_headers.get(CHECKSUM_HEADER)
+                if skip_unchanged and checksum and _unchanged(target, member, checksum):
+                    report.skipped += 1
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _extract(tar, member, target, checksum)
+                report.written += 1
+                report.bytes_written += member.size
+    except (tarfile.TarError, EOFError, gzip.BadGzipFile) as exc:
+        raise ArchiveError(f"Corrupt archive: {exc}") from exc
+    if report is None:
+        raise ArchiveError("Empty archive")
+    return report
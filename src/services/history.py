@@ -0,0 +1,341 @@
+"""
+Version history of notes.
+
+Each directory keeps its history in a hidden .history folder:
+
+    .history/objects/ab/cdef...   zlib-compressed version objects
+    .history/log/<note>.jsonl     one line per recorded version
+
+Objects are addressed by the SHA-256 of the note content they encode,
+so identical versions (of any note) are stored once. An object is
+either a full copy or a delta against the note's previous version: the
+bytes the two share at the start and end are referenced, only the
+changed middle is stored. At most HISTORY_MAX_CHAIN deltas separate a
+version from a full copy, which bounds the work of reading any version.
+Notes larger than HISTORY_DELTA_MAX_BYTES are hashed and stored as full
+copies in a streaming way, never held in memory.
+
+Log line:
+    {"hash": ..., "size": ..., "mtime_ns": ..., "time": ..., "event": ..., "depth": ...}
+"""
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+import logging
+
+from src.utils.helpers import atomic_write_bytes, atomic_write_text
+from src.services.note_storage import open_note_binary, plain_name
+from configs.storage import (
+    COMPRESS_LEVEL, HISTORY_DELTA_MAX_BYTES, HISTORY_DIR_NAME, HISTORY_MAX_CHAIN,
+)
+
+logger = logging.getLogger(__name__)
+
+_FULL = b"F"
+_DELTA = b"D"
+_READ_CHUNK = 1 << 20
+
+
+class HistoryError(ValueError):
+    """Raised when a version does not exist or cannot be read."""
+
+
+@dataclass(frozen=True)
+class NoteVersion:
+    """One recorded version of a note."""
+
+    number: int
+    hash: str
+    size: int
+    mtime_ns: int
+    time: float
+    event: str
+    depth: int
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open_note_binary(path) as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """Return the length of the common prefix of a and b (binary search over slices)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _delta(base: bytes, data: bytes) -> Tuple[int, int, bytes]:
+    """Return (shared leading bytes, shared trailing bytes, changed middle)."""
+    prefix = _common_prefix(base, data)
+    limit = min(len(base), len(data)) - prefix
+    suffix = _common_prefix(base[::-1][:limit], data[::-1][:limit])
+    return prefix, suffix, data[prefix:len(data) - suffix]
+
+
+class HistoryStore:
+    """Content-addressed, delta-compressed version store of a directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_chain: int = HISTORY_MAX_CHAIN,
+        delta_max_bytes: int = HISTORY_DELTA_MAX_BYTES,
+    ):
+        self.root = Path(directory) / HISTORY_DIR_NAME
+        self.max_chain = max_chain
+        self.delta_max_bytes = delta_max_bytes
+        # Latest version of notes seen in this process (metadata only)
+        self._latest: Dict[str, NoteVersion] = {}
+
+    # Paths
+    def _log_path(self, name: str) -> Path:
+        """
+        Return the log file of a note.
+
+        Raises:
+            HistoryError: if name is not a plain note filename
+        """
+        name = plain_name(name)
+        if not name or name == ".." or "/" in name or "\\" in name or os.sep in name:
+            raise HistoryError(f"Invalid note name: {name!r}")
+        return self.root / "log" / f"{name}.jsonl"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    # Objects
+    def _write_object(self, digest: str, payload: bytes) -> None:
+        path = self._object_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, zlib.compress(payload, COMPRESS_LEVEL))
+
+    def _write_object_stream(self, path: Path) -> Tuple[str, bool]:
+        """
+        Store a note as a full copy, hashing and compressing it as it is read.
+
+        Returns:
+            (content hash, True if the object already existed)
+        """
+        objects = self.root / "objects"
+        objects.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        packer = zlib.compressobj(COMPRESS_LEVEL)
+        fd, tmp = tempfile.mkstemp(dir=objects, prefix=".object.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, open_note_binary(path) as f:
+                out.write(packer.compress(_FULL))
+                for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+                    digest.update(chunk)
+                    out.write(packer.compress(chunk))
+                out.write(packer.flush())
+            target = self._object_path(digest.hexdigest())
+            if target.exists():
+                os.unlink(tmp)
+                return digest.hexdigest(), True
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        return digest.hexdigest(), False
+
+    def _read_object(self, digest: str) -> bytes:
+        try:
+            return zlib.decompress(self._object_path(digest).read_bytes())
+        except (OSError, zlib.error) as exc:
+            raise HistoryError(f"Unreadable history object {digest}: {exc}") from exc
+
+    def _object_depth(self, digest: str) -> int:
+        """Return the delta chain length of a stored object."""
+        raw = self._object_path(digest).read_bytes()
+        head = zlib.decompressobj().decompress(raw, 4096)
+        if head[:1] == _FULL:
+            return 0
+        return json.loads(head[1:head.index(b"\n")])["depth"]
+
+    def read(self, digest: str) -> bytes:
+        """Return the content stored under a hash."""
+        deltas = []
+        payload = self._read_object(digest)
+        while payload[:1] == _DELTA:
+            newline = payload.index(b"\n")
+            header = json.loads(payload[1:newline])
+            deltas.append((header["prefix"], header["suffix"], payload[newline + 1:]))
+            payload = self._read_object(header["base"])
+        data = payload[1:]
+        for prefix, suffix, middle in reversed(deltas):
+            data = data[:prefix] + middle + data[len(data) - suffix:]
+        return data
+
+    # Logs
+    @staticmethod
+    def _log_line(version: NoteVersion) -> str:
+        entry = {
+            "hash": version.hash, "size": version.size, "mtime_ns": version.mtime_ns,
+            "time": version.time, "event": version.event, "depth": version.depth,
+        }
+        return json.dumps(entry) + "\n"
+
+    def _append_log(self, name: str, version: NoteVersion) -> None:
+        path = self._log_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(self._log_line(version))
+
+    def versions(self, name: str) -> List[NoteVersion]:
+        """Return all recorded versions of a note, oldest first (numbered from 1)."""
+        path = self._log_path(name)
+        try:
+            with path.open(encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        except ValueError as exc:
+            raise HistoryError(f"Corrupt history log of {name}: {exc}") from exc
+        return [NoteVersion(number=i, **entry) for i, entry in enumerate(entries, 1)]
+
+    def _last(self, name: str) -> Optional[NoteVersion]:
+        """Return the latest version of a note, parsing only the log's last line."""
+        cached = self._latest.get(plain_name(name))
+        if cached is not None:
+            return cached
+        try:
+            raw = self._log_path(name).read_bytes().rstrip(b"\n")
+        except FileNotFoundError:
+            return None
+        if not raw:
+            return None
+        try:
+            entry = json.loads(raw.rsplit(b"\n", 1)[-1])
+        except ValueError as exc:
+            raise HistoryError(f"Corrupt history log of {name}: {exc}") from exc
+        last = NoteVersion(number=raw.count(b"\n") + 1, **entry)
+        self._latest[plain_name(name)] = last
+        return last
+
+    # Recording
+    def _read_small(self, path: Path, size: int) -> Optional[bytes]:
+        """Return a note's content if it fits within delta_max_bytes, else None."""
+        if size > self.delta_max_bytes:
+            return None
+        # Compressed notes may hold more than their file size
+        with open_note_binary(path) as f:
+            data = f.read(self.delta_max_bytes + 1)
+        return data if len(data) <= self.delta_max_bytes else None
+
+    def snapshot(self, path: Path, event: str = "open") -> Optional[NoteVersion]:
+        """
+        Record the current content of a note unless it is already recorded.
+
+        Opening a note whose size and mtime match its last version costs
+        a single stat. Other events (delete, rename, restore) are always
+        logged.
+
+        Returns:
+            The new version, or None if nothing changed
+        """
+        name = plain_name(path.name)
+        st = path.stat()
+        last = self._last(name)
+        if event == "open" and last is not None and (last.size, last.mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return None
+
+        data = self._read_small(path, st.st_size)
+        if data is not None:
+            digest = hashlib.sha256(data).hexdigest()
+        elif event == "open" and last is not None and last.size == st.st_size:
+            digest = _hash_file(path)
+        else:
+            digest = None
+        if event == "open" and last is not None and last.hash == digest:
+            # Touched but not modified: remember the new mtime for this process
+            self._latest[name] = replace(last, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            return None
+
+        if data is not None:
+            depth = self._store(name, digest, data, last)
+        else:
+            digest, existed = self._write_object_stream(path)
+            depth = self._object_depth(digest) if existed else 0
+        version = NoteVersion(
+            number=(last.number if last else 0) + 1, hash=digest, size=st.st_size,
+            mtime_ns=st.st_mtime_ns, time=time.time(), event=event, depth=depth,
+        )
+        self._append_log(name, version)
+        self._latest[name] = version
+        logger.info("Note version recorded: %s v%d (%s)", path, version.number, event)
+        return version
+
+    def _store(self, name: str, digest: str, data: bytes, last: Optional[NoteVersion]) -> int:
+        """Store content, as a delta against last when worthwhile; return its chain depth."""
+        if self._object_path(digest).exists():
+            return self._object_depth(digest)
+
+        if last is not None and last.depth < self.max_chain and last.size <= self.delta_max_bytes:
+            try:
+                base = self.read(last.hash)
+            except HistoryError:
+                logger.exception("History base unreadable, storing a full copy: %s", name)
+            else:
+                prefix, suffix, middle = _delta(base, data)
+                if prefix or suffix:
+                    header = {"base": last.hash, "depth": last.depth + 1, "prefix": prefix, "suffix": suffix}
+                    self._write_object(digest, _DELTA + json.dumps(header).encode() + b"\n" + middle)
+                    return last.depth + 1
+
+        self._write_object(digest, _FULL + data)
+        return 0
+
+    # Maintenance
+    def rename(self, old_name: str, new_name: str) -> None:
+        """
+        Move the history of a note to its new name.
+
+        If a deleted note of that name left a history behind, the moved
+        versions are appended to it rather than overwriting it.
+        """
+        old_log, new_log = self._log_path(old_name), self._log_path(new_name)
+        self._latest.pop(plain_name(old_name), None)
+        self._latest.pop(plain_name(new_name), None)
+        if not old_log.exists():
+            return
+        if not new_log.exists():
+            os.replace(old_log, new_log)
+            return
+        merged = self.versions(new_name) + self.versions(old_name)
+        atomic_write_text(new_log, "".join(self._log_line(v) for v in merged))
+        old_log.unlink()
+        logger.info("Merged note history: %s into %s", old_name, new_name)
+
+    def version(self, name: str, number: int) -> NoteVersion:
+        """
+        Return one version of a note.
+
+        Raises:
+            HistoryError: if the note has no such version
+        """
+        versions = self.versions(name)
+        if not 1 <= number <= len(versions):
+            raise HistoryError(f"No version {number} of {plain_name(name)}")
+        return versions[number - 1]
@@ -0,0 +1,346 @@
+"""
+Per-directory manifest of note metadata.
+
+Each workspace and notebook keeps a hidden .manifest/notes.json
+describing its notes (title, size, mtime, inode) and listing its
+notebook subdirectories. Reads check the directory's mtime, one stat,
+and trust the manifest while it matches. When it does not, the
+directory is re-read with a single scandir: notes whose inode, size and
+mtime are unchanged keep their entry, others are described again. The
+content hash and line count are only computed when asked for (details())
+and kept until the note changes.
+
+Editing a file in place does not move its directory's mtime, so notes
+likely to be edited in place (new notes, notes opened in the editor)
+are marked dirty and stat'ed on every read until MANIFEST_DIRTY_SECONDS
+have passed since they were marked or last modified. The task list is
+always stat'ed; a changed one is re-described on the next read, never
+by the task commands themselves. Search re-stats every note anyway and
+reports what it finds changed through check().
+
+The manifest is replaced atomically inside its own hidden folder, so
+saving it does not change the mtime of the directory it describes.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+
+from src.utils.helpers import atomic_write_text
+from src.services.note_storage import NOTE_SUFFIX, is_note_name, open_note_binary, plain_name
+from src.services.task_service import TaskService
+from configs.storage import MANIFEST_DIR_NAME, MANIFEST_DIRTY_SECONDS, MANIFEST_FILE_NAME
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class NoteMeta:
+    """Cached metadata of one note file."""
+
+    name: str
+    title: str
+    size: int
+    mtime_ns: int
+    inode: int
+    # Computed on demand (DirectoryManifest.details)
+    sha256: Optional[str] = None
+    lines: Optional[int] = None
+
+
+def describe_note(path: Path, content: bool = False) -> NoteMeta:
+    """Stat a note to build its metadata; read it too if content is True."""
+    st = path.stat()
+    title = plain_name(path.name)[: -len(NOTE_SUFFIX)].replace("_", " ")
+    meta = NoteMeta(
+        name=path.name, title=title, size=st.st_size, mtime_ns=st.st_mtime_ns, inode=st.st_ino,
+    )
+    if not content:
+        return meta
+    digest = hashlib.sha256()
+    lines = 0
+    last = b"\n"
+    with open_note_binary(path) as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    return replace(meta, sha256=digest.hexdigest(), lines=lines)
+
+
+class DirectoryManifest:
+    """Note metadata of one directory, reconciled lazily against its mtime."""
+
+    VERSION = 1
+    RACY_WINDOW_NS = 1_000_000_000
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_DIR_NAME / MANIFEST_FILE_NAME
+        self._notes: Dict[str, NoteMeta] = {}
+        self._dirs: List[str] = []
+        # Dirty note -> when it was marked (ns)
+        self._dirty: Dict[str, int] = {}
+        self._pending: Set[str] = set()
+        self._dir_mtime_ns: Optional[int] = None
+        self._checked_ns = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # Persistence
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+            notes = {entry["name"]: NoteMeta(**entry) for entry in data["notes"]}
+            dirs = list(data["dirs"])
+            dirty = {str(name): int(marked) for name, marked in data["dirty"].items()}
+            dir_mtime_ns, checked_ns = int(data["dir_mtime_ns"]), int(data["checked_ns"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Corrupt manifest, rebuilding: %s (%s)", self.path, exc)
+            return
+        self._notes, self._dirs = notes, dirs
+        self._dirty = {**dirty, **self._dirty}
+        self._dir_mtime_ns, self._checked_ns = dir_mtime_ns, checked_ns
+
+    def _save(self) -> None:
+        data = {
+            "version": self.VERSION,
+            "dir_mtime_ns": self._dir_mtime_ns,
+            "checked_ns": self._checked_ns,
+            "dirs": self._dirs,
+            "dirty": self._dirty,
+            "notes": [asdict(meta) for meta in self._notes.values()],
+        }
+        try:
+            # Creating the folder changes the directory's mtime once; the
+            # next refresh re-reads the directory and records the new one
+            self.path.parent.mkdir(exist_ok=True)
+            atomic_write_text(self.path, json.dumps(data, separators=(",", ":")))
+        except OSError:
+            logger.exception("Failed to save manifest: %s", self.path)
+
+    # Reconciliation
+    def _trusted(self, mtime_ns: int) -> bool:
+        return (
+            mtime_ns == self._dir_mtime_ns
+            and self._checked_ns - mtime_ns > self.RACY_WINDOW_NS
+        )
+
+    def _reconcile(self, mtime_ns: int) -> bool:
+        """
+        Re-read the directory, re-describing only new or replaced notes.
+
+        Returns:
+            True if the manifest needs saving
+        """
+        checked_ns = time.time_ns()
+        notes: Dict[str, NoteMeta] = {}
+        dirs: List[str] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif is_note_name(entry.name) and entry.is_file(follow_symlinks=False):
+                    known = self._notes.get(entry.name)
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if (
+                            known is not None and entry.name not in self._pending
+                            and (known.size, known.mtime_ns, known.inode) == (st.st_size, st.st_mtime_ns, st.st_ino)
+                        ):
+                            notes[entry.name] = known
+                            continue
+                        notes[entry.name] = describe_note(Path(entry.path))
+                    except OSError:
+                        logger.exception("Failed to describe note: %s", entry.path)
+                    self._pending.discard(entry.name)
+        dirs.sort()
+        was_trusted = self._checked_ns - mtime_ns > self.RACY_WINDOW_NS
+        changed = (
+            notes != self._notes or dirs != self._dirs or mtime_ns != self._dir_mtime_ns
+            # Persist the first check made after the racy window
+            or (not was_trusted and checked_ns - mtime_ns > self.RACY_WINDOW_NS)
+        )
+        self._notes, self._dirs = notes, dirs
+        self._dirty = {name: marked for name, marked in self._dirty.items() if name in notes}
+        self._pending &= notes.keys()
+        self._dir_mtime_ns, self._checked_ns = mtime_ns, checked_ns
+        return changed
+
+    def _check(self, names: Iterable[str]) -> bool:
+        """Re-stat notes that may have changed in place; return True if any did."""
+        changed = False
+        now_ns = time.time_ns()
+        for name in list(names):
+            path = self.directory / name
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                changed |= self._notes.pop(name, None) is not None
+                changed |= self._dirty.pop(name, None) is not None
+                self._pending.discard(name)
+                continue
+            known = self._notes.get(name)
+            if name in self._pending or known is None or (known.size, known.mtime_ns, known.inode) != (
+                st.st_size, st.st_mtime_ns, st.st_ino
+            ):
+                try:
+                    self._notes[name] = describe_note(path)
+                except OSError:
+                    logger.exception("Failed to describe note: %s", path)
+                self._pending.discard(name)
+                changed = True
+            elif (
+                name in self._dirty
+                and now_ns - max(self._dirty[name], st.st_mtime_ns) > MANIFEST_DIRTY_SECONDS * 1_000_000_000
+            ):
+                del self._dirty[name]
+                changed = True
+        return changed
+
+    def refresh(self) -> None:
+        """Bring the manifest up to date (one stat when nothing changed)."""
+        with self._lock:
+            try:
+                mtime_ns = os.stat(self.directory).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                self._notes, self._dirs, self._dirty, self._pending = {}, [], {}, set()
+                self._dir_mtime_ns = None
+                return
+            changed = False
+            if not self._loaded:
+                self._load()
+            if not self._trusted(mtime_ns):
+                changed = self._reconcile(mtime_ns)
+            changed |= self._check(self._dirty.keys() | self._pending | {TaskService.TASK_FILE_NAME})
+            if changed:
+                self._save()
+
+    # Updates from the services
+    def update(self, *names: str) -> None:
+        """Re-describe notes a service has just written, created or removed."""
+        with self._lock:
+            self._pending.update(names)
+        self.refresh()
+
+    def mark_dirty(self, name: str) -> None:
+        """Watch a note that is (or will be) edited in place, starting now."""
+        with self._lock:
+            self._dirty[name] = time.time_ns()
+            self._pending.add(name)
+        self.refresh()
+
+    def check(self, *names: str) -> None:
+        """Re-stat notes that may have changed in place, describing those that did."""
+        with self._lock:
+            self.refresh()
+            if self._check(names):
+                self._save()
+
+    # Reads
+    def notes(self) -> Dict[str, NoteMeta]:
+        """Return metadata of the directory's notes by stored filename."""
+        self.refresh()
+        with self._lock:
+            return dict(self._notes)
+
+    def dirs(self) -> List[str]:
+        """Return the names of visible subdirectories, sorted."""
+        self.refresh()
+        with self._lock:
+            return list(self._dirs)
+
+    def lookup(self, filename: str) -> Optional[NoteMeta]:
+        """Return a note's metadata by its .txt name, plain or compressed."""
+        self.refresh()
+        with self._lock:
+            meta = self._notes.get(filename)
+            if meta is None and filename.endswith(NOTE_SUFFIX):
+                meta = self._notes.get(filename + ".gz")
+            return meta
+
+    def details(self, filename: str) -> Optional[NoteMeta]:
+        """Return a note's metadata including its content hash and line count."""
+        meta = self.lookup(filename)
+        if meta is None or meta.sha256 is not None:
+            return meta
+        with self._lock:
+            try:
+                meta = describe_note(self.directory / meta.name, content=True)
+            except FileNotFoundError:
+                return None
+            except (OSError, EOFError):
+                logger.exception("Failed to read note: %s", self.directory / meta.name)
+                return meta
+            self._notes[meta.name] = meta
+            self._save()
+        return meta
+
+    def resolve(self, filename: str) -> Path:
+        """
+        Return the file storing a note, accepting the .txt name of a compressed note.
+
+        Raises:
+            FileNotFoundError: if the note does not exist
+        """
+        meta = self.lookup(filename)
+        if meta is None:
+            raise FileNotFoundError("Note not found")
+        return self.directory / meta.name
+
+    def exists(self, filename: str) -> bool:
+        """Return True if a note exists in plain or compressed form."""
+        return self.lookup(plain_name(filename)) is not None
+
+
+class ManifestCache:
+    """Process-wide LRU of directory manifests."""
+
+    def __init__(self, max_dirs: int = 1024):
+        self.max_dirs = max_dirs
+        self._cache: "OrderedDict[str, DirectoryManifest]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, directory: Path) -> DirectoryManifest:
+        """Return the manifest of a directory."""
+        key = os.fspath(directory)
+        with self._lock:
+            manifest = self._cache.get(key)
+            if manifest is None:
+                manifest = self._cache[key] = DirectoryManifest(Path(directory))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_dirs:
+                self._cache.popitem(last=False)
+            return manifest
+
+    def walk(self, directory: Path) -> Iterator[Tuple[str, NoteMeta]]:
+        """Yield (relative path, metadata) of every note below directory."""
+        stack = [(Path(directory), "")]
+        while stack:
+            current, prefix = stack.pop()
+            manifest = self.get(current)
+            for name, meta in manifest.notes().items():
+                yield prefix + name, meta
+            stack.extend((current / sub, f"{prefix}{sub}/") for sub in manifest.dirs())
+
+
+# Shared by all services, like the listing cache
+manifests = ManifestCache()
@@ -1,49 +1,128 @@
 """
 Note management service.
+
+Notes are stored as <title>.txt, or as <title>.txt.gz once compacted
+(see note_storage); every method accepts the .txt name for both.
+
+Opening, renaming and deleting a note first records its content in the
+directory's version history (see history).
+
+Existence checks, listings and metadata come from the directory's
+manifest (see manifest), which every mutating method keeps up to date.
 """
 
+from dataclasses import replace
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
 import logging
+import time
 
-from src.utils.helpers import open_file_cross_platform
+from src.utils.helpers import atomic_write_bytes, open_file_cross_platform
+from src.utils.listing import iter_sorted, listing_cache
+from src.utils.name_index import name_index
+from src.utils.metrics import timed
+from src.services.search_index import SearchIndex, IndexCorruptError
+from src.services.scan_engine import scan_files
+from src.services.note_storage import (
+    NOTE_SUFFIX, NOTE_SUFFIXES, CompactionReport, compress_note, decompress_note,
+    is_compressed, plain_name, should_compress,
+)
+from src.services.manifest import NoteMeta, manifests
+from src.services.task_service import TaskService
+from src.services.history import HistoryError, HistoryStore, NoteVersion
+from src.services.ranking import SearchHit, make_snippet, query_terms, rank
+from src.services.query import run_query
+from src.services.regex_search import RegexMatch, compile_pattern, grep_files, required_literals
+from configs.search import RANKED_TOP_K, REGEX_MAX_BYTES_PER_FILE
 
 logger = logging.getLogger(__name__)
 
+
+def _as_note(path: Path) -> Path:
+    """Return a note's path under its .txt name, hiding compression from callers."""
+    return path.with_name(plain_name(path.name))
+
+
 class NoteService:
     """Manage text notes in a directory (workspace or notebook)."""
 
     def __init__(self, directory: Path):
         self.directory = Path(directory)
+        self.index = SearchIndex(self.directory)
+        self.history = HistoryStore(self.directory)
+        self.manifest = manifests.get(self.directory)
 
     def _note_filename(self, title: str) -> str:
         """Generate filename from note title."""
         return f"{title.strip().replace(' ', '_')}.txt"
 
-    def create_note(self, title: str) -> Path:
-        """Create a note file open it."""
+    @timed()
+    def create_note(self, title: str, open_after: bool = True) -> Path:
+        """Create a note file and (unless open_after is False) open it."""
         if not title.strip():
             raise ValueError("Title must not be empty")
         path = self.directory / self._note_filename(title)
-        if path.exists():
+        if self.manifest.exists(path.name):
             raise FileExistsError("Note already exists")
         path.touch()
+        listing_cache.invalidate(self.directory)
+        # A new note is about to be written, most likely in place
+        self.manifest.mark_dirty(path.name)
         logger.info("Note created: %s", path)
-        try:
-            open_file_cross_platform(str(path))
-        except Exception:
-            logger.exception("Failed to open note: %s", path)
+        if open_after:
+            try:
+                open_file_cross_platform(str(path))
+            except Exception:
+                logger.exception("Failed to open note: %s", path)
         return path
 
+    @timed()
     def list_notes(self) -> List[str]:
-        """List note filenames in the directory."""
-        return [p.name for p in self.directory.glob("*.txt")]
+        """List note filenames in the directory, sorted by name."""
+        return list(self.iter_notes())
 
-    def open_note(self, filename: str) -> Path:
-        """Open a note file."""
-        path = self.directory / filename
-        if not path.exists():
+    def iter_notes(
+        self,
+        sort: str = "name",
+        reverse: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield note filenames sorted by name, mtime or size, with paging."""
+        notes = self.manifest.notes()
+        meta = {name: (m.mtime_ns, m.size) for name, m in notes.items()}
+        return map(plain_name, iter_sorted(self.directory, notes, sort, reverse, offset, limit, meta))
+
+    @timed()
+    def note_info(self, filename: str) -> NoteMeta:
+        """
+        Return a note's title, size, mtime, content hash and line count.
+
+        Raises:
+            FileNotFoundError: if the note does not exist
+        """
+        meta = self.manifest.details(filename)
+        if meta is None:
             raise FileNotFoundError("Note not found")
+        return meta
+
+    @timed()
+    def suggest_notes(self, query: str, limit: int = 5) -> List[str]:
+        """Return note filenames matching a partial or misspelled name."""
+        names = name_index.files(self.directory, *NOTE_SUFFIXES).lookup(query, limit)
+        return [plain_name(name) for name in names]
+
+    @timed()
+    def open_note(self, filename: str) -> Path:
+        """Open a note file (a compressed note is decompressed for editing)."""
+        path = self.manifest.resolve(filename)
+        if is_compressed(path):
+            compressed = path
+            path = decompress_note(path)
+            listing_cache.invalidate(self.directory)
+            self.manifest.update(compressed.name, path.name)
+        self._snapshot(path, "open")
+        self.manifest.mark_dirty(path.name)
         try:
             open_file_cross_platform(str(path))
         except Exception:
@@ -51,38 +130,240 @@ class NoteService:
             raise
         return path
 
+    @timed()
     def delete_note(self, filename: str) -> None:
         """Delete a note file."""
-        path = self.directory / filename
-        if not path.exists():
-            raise FileNotFoundError("Note not found")
+        path = self.manifest.resolve(filename)
+        self._snapshot(path, "delete")
         path.unlink()
+        listing_cache.invalidate(self.directory)
+        self.manifest.update(path.name)
         logger.info("Note deleted: %s", path)
 
+    @timed()
     def rename_note(self, old_name: str, new_title: str) -> Path:
-        """Rename a note file."""
-        old_path = self.directory / old_name
-        if not old_path.exists():
-            raise FileNotFoundError("Note not found")
-        new_path = self.directory / self._note_filename(new_title)
-        if new_path.exists():
+        """Rename a note file, keeping its storage form."""
+        old_path = self.manifest.resolve(old_name)
+        new_name = self._note_filename(new_title)
+        if self.manifest.exists(new_name):
             raise FileExistsError("Target note exists")
+        new_path = self.directory / (new_name + ".gz" if is_compressed(old_path) else new_name)
+        self._snapshot(old_path, "rename")
         old_path.rename(new_path)
+        self.history.rename(old_path.name, new_name)
+        listing_cache.invalidate(self.directory)
+        self.manifest.update(old_path.name, new_path.name)
         logger.info("Note renamed: %s -> %s", old_path, new_path)
         return new_path
 
-    def search_notes(self, keyword: str) -> List[Path]:
-        """Search notes by filename or content."""
+    @timed()
+    def note_history(self, filename: str) -> List[NoteVersion]:
+        """Return the recorded versions of a note (also of a deleted one), oldest first."""
+        return self.history.versions(filename)
+
+    @timed()
+    def read_version(self, filename: str, number: int) -> str:
+        """
+        Return the text of one version of a note.
+
+        Raises:
+            HistoryError: if the version does not exist or is unreadable
+        """
+        version = self.history.version(filename, number)
+        return self.history.read(version.hash).decode("utf-8", errors="replace")
+
+    @timed()
+    def restore_version(self, filename: str, number: int) -> Path:
+        """
+        Make an old version the current content of a note.
+
+        The current content is recorded first, so restoring can be undone.
+        Works for deleted notes too.
+
+        Raises:
+            HistoryError: if the version does not exist or is unreadable
+        """
+        version = self.history.version(filename, number)
+        data = self.history.read(version.hash)
+        name = plain_name(filename)
+        try:
+            current = self.manifest.resolve(name)
+        except FileNotFoundError:
+            current = None
+        if current is not None:
+            self._snapshot(current, "open")
+        path = self.directory / name
+        atomic_write_bytes(path, data)
+        if current is not None and current != path:
+            current.unlink()
+        listing_cache.invalidate(self.directory)
+        self.manifest.update(path.name, current.name if current else path.name)
+        self._snapshot(path, "restore")
+        logger.info("Note restored: %s (version %d)", path, number)
+        return path
+
+    def _snapshot(self, path: Path, event: str) -> None:
+        """Record a note version; history problems never block the caller."""
+        try:
+            self.history.snapshot(path, event)
+        except (OSError, EOFError, HistoryError):
+            logger.exception("Failed to record note version: %s", path)
+
+    @timed()
+    def search_notes(self, keyword: str, max_workers: Optional[int] = None) -> List[Path]:
+        """
+        Search notes by filename or content.
+
+        Answers from the directory's search index, refreshing it first.
+        Falls back to a full scan if the index is corrupt or unwritable.
+
+        Args:
+            max_workers: Scan processes (1 scans in this thread)
+        """
         keyword = keyword.lower().strip()
+        if not self._refresh_index():
+            return list(map(_as_note, self._scan_notes(keyword, max_workers)))
+
+        candidates, exact = self.index.candidates(keyword)
         matches = []
-        for p in self.directory.rglob("*.txt"):
+        to_scan = []
+        for doc_id in self.index.docs:
+            p = self.index.path_of(doc_id)
+            if keyword in plain_name(p.name).lower():
+                matches.append(p)
+            elif doc_id in candidates:
+                (matches if exact else to_scan).append(p)
+        return list(map(_as_note, matches + scan_files(to_scan, keyword, max_workers)))
+
+    @timed()
+    def search_ranked(self, query: str, k: int = RANKED_TOP_K) -> List[SearchHit]:
+        """
+        Return the k notes best matching query, ranked by BM25.
+
+        Each hit carries a snippet around the first matched term. If the
+        index is unavailable, notes containing the query are returned
+        unranked (score 0).
+        """
+        if not self._refresh_index():
+            keyword = query.lower().strip()
+            terms = query_terms(query)
+            hits = [SearchHit(p, 0.0, make_snippet(p, terms)) for p in self._scan_notes(keyword)[:k]]
+        else:
+            hits = rank(self.index, query, k)
+        return [replace(hit, path=_as_note(hit.path)) for hit in hits]
+
+    @timed()
+    def search_query(self, query: str) -> List[Path]:
+        """
+        Search note contents with a boolean query.
+
+        Supports AND, OR, NOT, "quoted phrases", prefix* wildcards and
+        parentheses (see src.services.query).
+
+        Raises:
+            QuerySyntaxError: if the query is malformed
+        """
+        index = self.index
+        if not self._refresh_index():
+            # Evaluate against a throwaway index built without the stored one
+            index = SearchIndex(self.directory)
+            index.refresh(persist=False, load=False)
+        return [_as_note(index.path_of(doc_id)) for doc_id in run_query(index, query)]
+
+    @timed()
+    def search_regex(
+        self,
+        pattern: str,
+        ignore_case: bool = True,
+        max_bytes: int = REGEX_MAX_BYTES_PER_FILE,
+    ) -> List[RegexMatch]:
+        """
+        Return the lines of notes matching a regular expression.
+
+        Notes that cannot contain the pattern's required literals are
+        skipped using the search index; the others are read line by line,
+        at most max_bytes each.
+
+        Raises:
+            ValueError: if the pattern is invalid
+        """
+        regex = compile_pattern(pattern, ignore_case)
+        if not self._refresh_index():
+            paths = sorted(self._note_paths())
+        else:
+            doc_ids = set(self.index.docs)
+            for literal in required_literals(pattern):
+                if not doc_ids:
+                    break
+                doc_ids &= self.index.candidates(literal.lower())[0]
+            paths = sorted(self.index.path_of(doc_id) for doc_id in doc_ids)
+        return [replace(m, path=_as_note(m.path)) for m in grep_files(paths, regex, max_bytes)]
+
+    @timed()
+    def compact_notes(self) -> CompactionReport:
+        """
+        Compress the directory's large or cold notes (see configs.storage).
+
+        Compressed notes stay listed, searchable and renameable under
+        their .txt names. The task list is never compressed.
+        """
+        report = CompactionReport()
+        now = time.time()
+        converted = []
+        for name in self.manifest.notes():
+            if not name.endswith(NOTE_SUFFIX):
+                continue
+            if name == TaskService.TASK_FILE_NAME:
+                continue
+            path = self.directory / name
             try:
-                if keyword in p.name.lower():
-                    matches.append(p)
+                st = path.stat()
+                if not should_compress(st, now):
                     continue
-                content = p.read_text(encoding="utf-8", errors="ignore").lower()
-                if keyword in content:
-                    matches.append(p)
-            except Exception:
-                logger.exception("Failed to read note: %s", p)
-        return matches
+                stored = compress_note(path)
+                if stored == path:
+                    continue
+                converted += [path.name, stored.name]
+                report.compressed += 1
+                report.bytes_before += st.st_size
+                report.bytes_after += stored.stat().st_size
+            except OSError:
+                logger.exception("Failed to compress note: %s", path)
+        if report.compressed:
+            listing_cache.invalidate(self.directory)
+            self.manifest.update(*converted)
+            logger.info(
+                "Notes compacted: %s (%d notes, %d -> %d bytes)",
+                self.directory, report.compressed, report.bytes_before, report.bytes_after,
+            )
+        return report
+
+    def _refresh_index(self) -> bool:
+        """
+        Bring the search index up to date.
+
+        Returns:
+            False if the index is corrupt or unwritable and a scan is needed
+        """
+        try:
+            self.index.refresh()
+        except IndexCorruptError:
+            logger.warning("Search index corrupt, scanning instead: %s", self.index.index_file)
+            self.index.discard()
+            return False
+        except OSError:
+            logger.exception("Search index unavailable, scanning instead: %s", self.directory)
+            return False
+        return True
+
+    def _note_paths(self) -> List[Path]:
+        """Return every note below the directory, from the manifests."""
+        return [self.directory / rel for rel, _ in manifests.walk(self.directory)]
+
+    def _scan_notes(self, keyword: str, max_workers: Optional[int] = None) -> List[Path]:
+        """Search notes by scanning every file (no index)."""
+        matches = []
+        to_scan = []
+        for p in self._note_paths():
+            (matches if keyword in plain_name(p.name).lower() else to_scan).append(p)
+        return matches + scan_files(to_scan, keyword, max_workers)
@@ -0,0 +1,143 @@
+"""
+Plain and gzip-compressed note files.
+
+A note is stored either as <name>.txt or, once compacted, as
+<name>.txt.gz. Readers open both kinds through open_note_text /
+open_note_binary, which decompress as a stream, so no caller ever
+holds a whole note in memory.
+
+Compressed notes are decompressed again when opened for editing.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+import gzip
+import os
+import shutil
+import tempfile
+import time
+import logging
+
+from configs.storage import COMPRESS_COLD_DAYS, COMPRESS_LEVEL, COMPRESS_MIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+NOTE_SUFFIX = ".txt"
+COMPRESSED_SUFFIX = ".txt.gz"
+# Longest first, so stripping a suffix removes all of it
+NOTE_SUFFIXES = (COMPRESSED_SUFFIX, NOTE_SUFFIX)
+
+
+def is_note_name(name: str) -> bool:
+    """Return True for plain and compressed note filenames."""
+    return name.endswith(NOTE_SUFFIXES)
+
+
+def is_compressed(path: Path) -> bool:
+    """Return True if a note file is gzip-compressed."""
+    return path.name.endswith(COMPRESSED_SUFFIX)
+
+
+def plain_name(name: str) -> str:
+    """Return the .txt filename of a note, compressed or not."""
+    return name[: -len(".gz")] if name.endswith(COMPRESSED_SUFFIX) else name
+
+
+def storage_twin(name: str) -> Optional[str]:
+    """Return the name of the other storage form of a note (x.txt <-> x.txt.gz)."""
+    if name.endswith(COMPRESSED_SUFFIX):
+        return plain_name(name)
+    if name.endswith(NOTE_SUFFIX):
+        return name + ".gz"
+    return None
+
+
+def open_note_text(path: Path) -> TextIO:
+    """Open a note for reading text, decompressing as it is read."""
+    if is_compressed(path):
+        return gzip.open(path, "rt", encoding="utf-8", errors="ignore")
+    return open(path, encoding="utf-8", errors="ignore")
+
+
+def open_note_binary(path: Path) -> BinaryIO:
+    """Open a note for reading bytes, decompressing as it is read."""
+    if is_compressed(path):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def stored_bytes_read(f: TextIO) -> int:
+    """Return how many bytes of the file on disk a reader has consumed."""
+    buffer = f.buffer
+    if isinstance(buffer, gzip.GzipFile):
+        return buffer.fileobj.tell()
+    return buffer.tell()
+
+
+@dataclass
+class CompactionReport:
+    """Result of compacting the notes of a directory."""
+
+    compressed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def should_compress(st: os.stat_result, now: Optional[float] = None) -> bool:
+    """Return True if a plain note is large or cold enough to compress."""
+    now = time.time() if now is None else now
+    return st.st_size >= COMPRESS_MIN_BYTES or now - st.st_mtime >= COMPRESS_COLD_DAYS * 86400
+
+
+def _convert(source: Path, target: Path, compress: bool, level: int = COMPRESS_LEVEL) -> None:
+    """Stream source into target (atomically), keeping its timestamps."""
+    st = source.stat()
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            if compress:
+                with open(source, "rb") as src, gzip.GzipFile(
+                    filename=plain_name(target.name), mode="wb", compresslevel=level,
+                    fileobj=raw, mtime=int(st.st_mtime),
+                ) as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with gzip.open(source, "rb") as src:
+                    shutil.copyfileobj(src, raw)
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def compress_note(path: Path, level: int = COMPRESS_LEVEL) -> Path:
+    """
+    Replace a plain note with a gzip-compressed copy.
+
+    The note is left as it is if compression would not make it smaller.
+
+    Returns:
+        The path now storing the note
+    """
+    target = path.with_name(path.name + ".gz")
+    _convert(path, target, compress=True, level=level)
+    if target.stat().st_size >= path.stat().st_size:
+        target.unlink()
+        return path
+    path.unlink()
+    logger.info("Note compressed: %s", target)
+    return target
+
+
+def decompress_note(path: Path) -> Path:
+    """Replace a compressed note with its plain text; return the new path."""
+    target = path.with_name(plain_name(path.name))
+    _convert(path, target, compress=False)
+    path.unlink()
+    logger.info("Note decompressed: %s", target)
+    return target
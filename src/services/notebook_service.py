@@ -3,12 +3,16 @@ Notebook management service.
 """
 
 from pathlib import Path
-import shutil
-from typing import List
+from typing import Dict, Iterator, List, Optional
 import logging
 
 from src.services.note_service import NoteService
 from src.services.task_service import TaskService
+from src.services.trash import Trash
+from src.services.manifest import manifests
+from src.utils.listing import iter_sorted, listing_cache
+from src.utils.name_index import name_index
+from src.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +20,18 @@ logger = logging.getLogger(__name__)
 class NotebookService:
     """
     Manage notebooks within a workspace path.
+
+    Note and task services are built once per notebook and reused until
+    the notebook is deleted. Deleted notebooks go to the user's trash.
     """
 
     def __init__(self, workspace_path: Path):
         self.workspace_path = Path(workspace_path)
+        self.trash = Trash(self.workspace_path.parent)
+        self._note_services: Dict[str, NoteService] = {}
+        self._task_services: Dict[str, TaskService] = {}
 
+    @timed()
     def create_notebook(self, name: str) -> Path:
         """Create a notebook directory."""
         if not name.strip():
@@ -31,50 +42,66 @@ class NotebookService:
             raise FileExistsError("Notebook already exists")
 
         notebook_path.mkdir(parents=True)
+        listing_cache.invalidate(self.workspace_path)
         logger.info("Notebook created: %s", notebook_path)
         return notebook_path
 
+    @timed()
     def list_notebooks(self) -> List[str]:
-        """List notebook directories in workspace."""
-        if not self.workspace_path.exists():
-            return []
-
-        return [p.name for p in self.workspace_path.iterdir() if p.is_dir()]
-
+        """List notebook directories in workspace, sorted by name."""
+        return list(self.iter_notebooks())
+
+    def iter_notebooks(
+        self,
+        sort: str = "name",
+        reverse: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield notebook names sorted by name, mtime or size, with paging."""
+        names = listing_cache.dirs(self.workspace_path)
+        return iter_sorted(self.workspace_path, names, sort, reverse, offset, limit)
+
+    @timed()
+    def suggest_notebooks(self, query: str, limit: int = 5) -> List[str]:
+        """Return notebook names matching a partial or misspelled name."""
+        return name_index.dirs(self.workspace_path).lookup(query, limit)
+
+    @timed()
     def delete_notebook(self, name: str, force: bool = False) -> None:
         """
-        Delete a notebook directory.
+        Move a notebook directory to the trash (restorable for a while).
         """
-        notebook_path = self.workspace_path / name
-
-        if not notebook_path.exists() or not notebook_path.is_dir():
-            raise FileNotFoundError("Notebook not found")
+        notebook_path = self.select_notebook(name)
 
-        if any(notebook_path.iterdir()) and not force:
+        # Hidden files are app metadata (index, history, manifest), not content
+        if not force and any(not p.name.startswith(".") for p in notebook_path.iterdir()):
             raise ValueError("Notebook is not empty. Use force=True to delete.")
 
-        shutil.rmtree(notebook_path)
+        self.trash.move(notebook_path, "notebook")
+        self._note_services.pop(name, None)
+        self._task_services.pop(name, None)
         logger.info("Notebook deleted: %s", notebook_path)
 
+    @timed()
     def select_notebook(self, name: str) -> Path:
         """Return notebook Path if exists."""
-        notebook_path = self.workspace_path / name
-
-        if not notebook_path.exists() or not notebook_path.is_dir():
+        if name not in manifests.get(self.workspace_path).dirs():
             raise FileNotFoundError("Notebook not found")
-
-        return notebook_path
+        return self.workspace_path / name
 
     def note_service_for(self, notebook_name: str) -> NoteService:
         """
         Return a NoteService scoped to a notebook.
         """
-        notebook_path = self.select_notebook(notebook_name)
-        return NoteService(notebook_path)
+        if notebook_name not in self._note_services:
+            self._note_services[notebook_name] = NoteService(self.select_notebook(notebook_name))
+        return self._note_services[notebook_name]
 
     def task_service_for(self, notebook_name: str) -> TaskService:
         """
         Return a TaskService scoped to a notebook.
         """
-        notebook_path = self.select_notebook(notebook_name)
-        return TaskService(notebook_path)
\ No newline at end of file
+        if notebook_name not in self._task_services:
+            self._task_services[notebook_name] = TaskService(self.select_notebook(notebook_name))
+        return self._task_services[notebook_name]
@@ -0,0 +1,282 @@
+"""
+Boolean and phrase queries over a SearchIndex.
+
+Syntax:
+    budget report            both words (AND is implied)
+    budget AND report        the same
+    budget OR forecast       either word
+    budget NOT draft         budget but not draft
+    "quarterly report"       the words next to each other, in order
+    proj*                    any word starting with proj
+    (budget OR cost) AND q3  parentheses group
+
+Operators must be written in upper case. Every query is evaluated on
+sorted postings lists: AND intersects starting from the smallest list,
+so the more selective a query is the less work it does. Only phrase
+candidates are read from disk, to check word order.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple, Union
+import heapq
+import logging
+import re
+
+from src.services.search_index import TOKEN_RE, SearchIndex, iter_tokens
+
+logger = logging.getLogger(__name__)
+
+_LEXER_RE = re.compile(r'"([^"]*)"?|(\()|(\))|([^\s()"]+)')
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a query cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class Term:
+    """One word."""
+
+    token: str
+
+
+@dataclass(frozen=True)
+class Prefix:
+    """Words starting with a prefix."""
+
+    prefix: str
+
+
+@dataclass(frozen=True)
+class Phrase:
+    """Words next to each other, in order."""
+
+    tokens: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    """Notes not matching the operand."""
+
+    operand: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    """Notes matching every operand."""
+
+    operands: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    """Notes matching any operand."""
+
+    operands: Tuple["Node", ...]
+
+
+Node = Union[Term, Prefix, Phrase, Not, And, Or]
+
+
+# Parsing
+def _lex(query: str) -> List[Tuple[str, str]]:
+    """Split a query into (kind, text) tokens."""
+    tokens = []
+    for phrase, lparen, rparen, word in _LEXER_RE.findall(query):
+        if lparen:
+            tokens.append(("(", lparen))
+        elif rparen:
+            tokens.append((")", rparen))
+        elif word in ("AND", "OR", "NOT"):
+            tokens.append((word, word))
+        elif word:
+            tokens.append(("word", word))
+        else:
+            tokens.append(("phrase", phrase))
+    return tokens
+
+
+def _word_node(text: str, phrase: bool) -> Node:
+    if not phrase and text.endswith("*"):
+        prefix = text.rstrip("*").lower()
+        if not TOKEN_RE.fullmatch(prefix):
+            raise QuerySyntaxError(f"Invalid prefix: {text}")
+        return Prefix(prefix)
+    words = tuple(TOKEN_RE.findall(text.lower()))
+    if not words:
+        raise QuerySyntaxError(f"Nothing to search for in: {text!r}")
+    # Words joined by punctuation (e-mail) are indexed as a phrase
+    return Term(words[0]) if len(words) == 1 else Phrase(words)
+
+
+class _Parser:
+    """Recursive descent parser: OR binds loosest, then AND, then NOT."""
+
+    def __init__(self, query: str):
+        self.tokens = _lex(query)
+        self.pos = 0
+
+    def _peek(self) -> str:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else ""
+
+    def _take(self) -> Tuple[str, str]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise QuerySyntaxError(f"Unexpected {self.tokens[self.pos][1]!r}")
+        return node
+
+    def _or(self) -> Node:
+        operands = [self._and()]
+        while self._peek() == "OR":
+            self._take()
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def _and(self) -> Node:
+        operands = [self._not()]
+        while self._peek() in ("AND", "NOT", "word", "phrase", "("):
+            if self._peek() == "AND":
+                self._take()
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def _not(self) -> Node:
+        if self._peek() == "NOT":
+            self._take()
+            return Not(self._not())
+        return self._atom()
+
+    def _atom(self) -> Node:
+        kind = self._peek()
+        if kind == "(":
+            self._take()
+            node = self._or()
+            if self._peek() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self._take()
+            return node
+        if kind in ("word", "phrase"):
+            return _word_node(self._take()[1], kind == "phrase")
+        raise QuerySyntaxError("Expected a word, phrase or '('" if not kind else f"Unexpected {kind!r}")
+
+
+def parse_query(query: str) -> Node:
+    """
+    Parse a query string.
+
+    Raises:
+        QuerySyntaxError: if the query is malformed
+    """
+    return _Parser(query).parse()
+
+
+# Sorted list operations
+def intersect(lists: List[List[int]]) -> List[int]:
+    """Intersect sorted id lists, smallest first, galloping through larger ones."""
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        kept = []
+        lo, end = 0, len(other)
+        for doc_id in result:
+            lo = bisect_left(other, doc_id, lo)
+            if lo == end:
+                break
+            if other[lo] == doc_id:
+                kept.append(doc_id)
+                lo += 1
+        result = kept
+    return result
+
+
+def union(lists: List[List[int]]) -> List[int]:
+    """Merge sorted id lists without duplicates."""
+    merged: List[int] = []
+    for doc_id in heapq.merge(*lists):
+        if not merged or merged[-1] != doc_id:
+            merged.append(doc_id)
+    return merged
+
+
+def difference(ids: List[int], excluded: List[int]) -> List[int]:
+    """Return the ids of a sorted list that are not in excluded."""
+    if not excluded:
+        return ids
+    drop = set(excluded)
+    return [doc_id for doc_id in ids if doc_id not in drop]
+
+
+def contains_phrase(path: Path, tokens: Tuple[str, ...]) -> bool:
+    """Return True if the note contains tokens consecutively (streamed)."""
+    window: deque = deque(maxlen=len(tokens))
+    last = tokens[-1]
+    try:
+        for token in iter_tokens(path):
+            window.append(token)
+            if token == last and tuple(window) == tokens:
+                return True
+    except (OSError, EOFError):
+        logger.exception("Failed to read note for phrase match: %s", path)
+    return False
+
+
+# Evaluation
+def evaluate(index: SearchIndex, node: Node) -> List[int]:
+    """Return the sorted ids of indexed notes matching a parsed query."""
+    if isinstance(node, Term):
+        return index.doc_ids(node.token)
+
+    if isinstance(node, Prefix):
+        vocabulary = index.vocabulary()
+        start = bisect_left(vocabulary, node.prefix)
+        lists = []
+        for i in range(start, len(vocabulary)):
+            if not vocabulary[i].startswith(node.prefix):
+                break
+            lists.append(index.doc_ids(vocabulary[i]))
+        return union(lists)
+
+    if isinstance(node, Phrase):
+        candidates = intersect([index.doc_ids(t) for t in node.tokens])
+        return [d for d in candidates if contains_phrase(index.path_of(d), node.tokens)]
+
+    if isinstance(node, Or):
+        return union([evaluate(index, op) for op in node.operands])
+
+    if isinstance(node, Not):
+        return difference(sorted(index.docs), evaluate(index, node.operand))
+
+    # And: intersect the positive operands, then drop the negated ones.
+    # Phrases are checked last, against the already narrowed candidates.
+    positive = [op for op in node.operands if not isinstance(op, (Not, Phrase))]
+    phrases = [op for op in node.operands if isinstance(op, Phrase)]
+    negative = [op.operand for op in node.operands if isinstance(op, Not)]
+    lists = [evaluate(index, op) for op in positive]
+    lists.extend(intersect([index.doc_ids(t) for t in p.tokens]) for p in phrases)
+    result = intersect(lists) if lists else sorted(index.docs)
+    for op in negative:
+        if not result:
+            break
+        result = difference(result, evaluate(index, op))
+    for phrase in phrases:
+        result = [d for d in result if contains_phrase(index.path_of(d), phrase.tokens)]
+    return result
+
+
+def run_query(index: SearchIndex, query: str) -> List[int]:
+    """Parse and evaluate a query string."""
+    return evaluate(index, parse_query(query))
@@ -0,0 +1,113 @@
+"""
+BM25 ranking over a SearchIndex.
+
+Postings are sorted by document id, so the postings of all query terms
+are merged and each document is scored as soon as its last posting has
+been seen. The scores stream into a k-sized heap: ranking never sorts
+or holds every matching note.
+
+Usage:
+    hits = rank(index, "project deadline", k=10)
+"""
+
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, List, Tuple
+import heapq
+import logging
+import math
+import re
+
+from src.services.search_index import TOKEN_RE, SearchIndex
+from src.services.note_storage import open_note_text
+from configs.search import BM25_B, BM25_K1, SNIPPET_CHARS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked search result."""
+
+    path: Path
+    score: float
+    snippet: str
+
+
+def query_terms(query: str) -> List[str]:
+    """Return the distinct index tokens of a query, in query order."""
+    return list(dict.fromkeys(TOKEN_RE.findall(query.lower())))
+
+
+def _weighted(postings: List[List[int]], idf: float) -> Iterator[Tuple[int, int, float]]:
+    """Yield (doc id, term frequency, idf) of one term's postings."""
+    for doc_id, tf in postings:
+        yield doc_id, tf, idf
+
+
+def iter_scores(
+    index: SearchIndex,
+    terms: List[str],
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> Iterator[Tuple[float, int]]:
+    """Yield (BM25 score, doc id) of every note containing a query term."""
+    total = len(index.docs)
+    average = index.average_length or 1.0
+    streams = []
+    for term in terms:
+        postings = index.postings.get(term)
+        if not postings:
+            continue
+        df = len(postings)
+        idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+        streams.append(_weighted(postings, idf))
+
+    for doc_id, group in groupby(heapq.merge(*streams, key=itemgetter(0)), key=itemgetter(0)):
+        norm = k1 * (1 - b + b * index.docs[doc_id].length / average)
+        yield sum(idf * tf * (k1 + 1) / (tf + norm) for _, tf, idf in group), doc_id
+
+
+def make_snippet(path: Path, terms: List[str], width: int = SNIPPET_CHARS) -> str:
+    """
+    Return the text around the first query term in a note.
+
+    Matched terms are highlighted as **term**. The note is read line by
+    line and only up to the first match.
+    """
+    if not terms:
+        return ""
+    pattern = re.compile(
+        r"(?<!\w)(?:%s)(?!\w)" % "|".join(map(re.escape, terms)), re.IGNORECASE
+    )
+    try:
+        with open_note_text(path) as f:
+            for line in f:
+                match = pattern.search(line)
+                if match:
+                    break
+            else:
+                return ""
+    except (OSError, EOFError):
+        logger.exception("Failed to read note for snippet: %s", path)
+        return ""
+
+    line = line.strip()
+    match = pattern.search(line)
+    start = max(0, match.start() - width // 2)
+    end = min(len(line), start + width)
+    text = pattern.sub(lambda m: f"**{m.group(0)}**", line[start:end])
+    return ("..." if start else "") + text + ("..." if end < len(line) else "")
+
+
+def rank(index: SearchIndex, query: str, k: int) -> List[SearchHit]:
+    """Return the k best notes for a query, best first, with snippets."""
+    terms = query_terms(query)
+    best = heapq.nlargest(k, iter_scores(index, terms), key=itemgetter(0))
+    hits = []
+    for score, doc_id in best:
+        path = index.path_of(doc_id)
+        hits.append(SearchHit(path, score, make_snippet(path, terms)))
+    return hits
@@ -0,0 +1,136 @@
+"""
+Regular expression search over notes.
+
+The pattern is compiled once. Literal strings that every match must
+contain are pulled out of the parsed pattern so notes can be filtered
+through the search index before the regex runs. Surviving notes are
+streamed line by line, up to a byte cap per note.
+
+Usage:
+    regex = compile_pattern(r"deadline:\\s+\\d{4}-\\d{2}")
+    required_literals(regex.pattern)      # ["deadline:", "-"]
+    grep_files(paths, regex)
+"""
+
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Pattern, Tuple
+import logging
+import re
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse  # type: ignore[no-redef]
+
+from src.services.scan_engine import map_files
+from src.services.note_storage import open_note_binary
+from configs.search import REGEX_MAX_BYTES_PER_FILE, SCAN_CHUNK_CHARS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RegexMatch:
+    """One matching line of a note."""
+
+    path: Path
+    line_no: int
+    line: str
+
+
+def compile_pattern(pattern: str, ignore_case: bool = True) -> Pattern:
+    """
+    Compile a user supplied pattern.
+
+    Raises:
+        ValueError: if the pattern is not a valid regular expression
+    """
+    try:
+        return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as exc:
+        raise ValueError(f"Invalid pattern: {exc}") from exc
+
+
+def required_literals(pattern: str) -> List[str]:
+    """Return literal strings that every match of pattern contains."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    literals: List[str] = []
+    _collect_literals(list(parsed), literals)
+    return literals
+
+
+def _collect_literals(items: list, literals: List[str]) -> None:
+    run: List[str] = []
+    for op, arg in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if run:
+            literals.append("".join(run))
+            run = []
+        # Groups and repeats that must occur at least once are required too;
+        # alternatives, classes and optional parts are not
+        if op is sre_parse.SUBPATTERN:
+            _collect_literals(list(arg[-1]), literals)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            _collect_literals(list(arg[2]), literals)
+    if run:
+        literals.append("".join(run))
+
+
+def grep_file(
+    path: Path,
+    regex: Pattern,
+    max_bytes: int = REGEX_MAX_BYTES_PER_FILE,
+    line_limit: int = SCAN_CHUNK_CHARS,
+) -> Tuple[List[Tuple[int, str]], int]:
+    """
+    Return ((line number, line) for matching lines, bytes read) of a note.
+
+    Lines longer than line_limit bytes are matched piecewise, and
+    reading stops after max_bytes.
+    """
+    hits: List[Tuple[int, str]] = []
+    read = 0
+    line_no = 0
+    at_line_start = True
+    try:
+        with open_note_binary(path) as f:
+            while read < max_bytes:
+                raw = f.readline(min(line_limit, max_bytes - read))
+                if not raw:
+                    break
+                read += len(raw)
+                if at_line_start:
+                    line_no += 1
+                at_line_start = raw.endswith(b"\n")
+                if hits and hits[-1][0] == line_no:
+                    continue
+                line = raw.decode("utf-8", errors="ignore").rstrip("\r\n")
+                if regex.search(line):
+                    hits.append((line_no, line))
+            else:
+                logger.info("Regex search stopped after %d bytes: %s", read, path)
+    except (OSError, EOFError):
+        logger.exception("Failed to read note: %s", path)
+    return hits, read
+
+
+def grep_files(
+    paths: List[Path],
+    regex: Pattern,
+    max_bytes: int = REGEX_MAX_BYTES_PER_FILE,
+    max_workers: Optional[int] = None,
+) -> List[RegexMatch]:
+    """Return the matching lines of all notes, in input order."""
+    results = map_files(partial(grep_file, regex=regex, max_bytes=max_bytes), paths, max_workers)
+    return [
+        RegexMatch(path, line_no, line)
+        for path, (hits, _) in zip(paths, results)
+        for line_no, line in hits
+    ]
@@ -0,0 +1,109 @@
+"""
+Chunked, parallel content scanner for notes.
+
+Notes are read in fixed-size chunks so peak memory per file stays
+bounded no matter how large a note is. Consecutive chunks overlap by
+len(keyword) - 1 characters so a keyword split across a boundary still
+matches, and reading stops at the first hit.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+import os
+import logging
+
+from src.utils.metrics import record_io
+from src.services.note_storage import open_note_text, stored_bytes_read
+from configs.search import SCAN_CHUNK_CHARS, SCAN_WORKERS, SCAN_PARALLEL_MIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def file_contains(path: Path, keyword: str, chunk_size: int = SCAN_CHUNK_CHARS) -> bool:
+    """
+    Check whether a note contains keyword (case-insensitive).
+
+    Args:
+        path: Note to scan
+        keyword: Lowercased keyword
+        chunk_size: Characters read per chunk
+
+    Returns:
+        True on the first match, False otherwise or if unreadable
+    """
+    return _scan_file(path, keyword, chunk_size)[0]
+
+
+def _scan_file(path: Path, keyword: str, chunk_size: int) -> Tuple[bool, int]:
+    """Return (matched, bytes read) for one note."""
+    if not keyword:
+        return True, 0
+    overlap = len(keyword) - 1
+    tail = ""
+    try:
+        with open_note_text(path) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return False, stored_bytes_read(f)
+                window = tail + chunk.lower()
+                if keyword in window:
+                    return True, stored_bytes_read(f)
+                tail = window[-overlap:] if overlap else ""
+    except Exception:
+        logger.exception("Failed to read note: %s", path)
+        return False, 0
+
+
+def _total_size(paths: List[Path]) -> int:
+    total = 0
+    for p in paths:
+        try:
+            total += os.stat(p).st_size
+        except OSError:
+            pass
+    return total
+
+
+def scan_files(
+    paths: Iterable[Path],
+    keyword: str,
+    max_workers: Optional[int] = None,
+    chunk_size: int = SCAN_CHUNK_CHARS,
+) -> List[Path]:
+    """Return the paths whose content contains keyword, in input order."""
+    paths = list(paths)
+    check = partial(_scan_file, keyword=keyword, chunk_size=chunk_size)
+    results = map_files(check, paths, max_workers)
+    return [p for p, (hit, _) in zip(paths, results) if hit]
+
+
+def map_files(
+    scan: Callable[[Path], Tuple[T, int]],
+    paths: List[Path],
+    max_workers: Optional[int] = None,
+) -> List[Tuple[T, int]]:
+    """
+    Apply scan to every path, in input order, and record the bytes read.
+
+    scan returns (result, bytes read) and must be picklable: large scans
+    are spread across a process pool, small ones run in-process to avoid
+    the pool start-up cost.
+    """
+    workers = max_workers or SCAN_WORKERS
+    results = None
+    if workers > 1 and len(paths) > 1 and _total_size(paths) >= SCAN_PARALLEL_MIN_BYTES:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                results = list(pool.map(scan, paths, chunksize=max(1, len(paths) // (workers * 4))))
+        except (OSError, NotImplementedError):
+            logger.exception("Parallel scan unavailable, scanning serially")
+    if results is None:
+        results = [scan(p) for p in paths]
+
+    record_io(bytes_read=sum(n for _, n in results), files=len(paths))
+    return results
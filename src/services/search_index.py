@@ -0,0 +1,360 @@
+"""
+Persistent inverted index for note search.
+
+One index file lives in each indexed directory (workspace or notebook)
+and maps every token to the notes containing it.
+
+File format (JSON):
+    {
+        "version": 1,
+        "next_id": <int>,
+        "docs": [[doc_id, relpath, mtime_ns, size, length], ...],
+        "postings": {token: [[doc_id, term_frequency], ...]}
+    }
+
+Postings are kept sorted by doc_id. On refresh every note is stat'ed
+(a note edited in place does not change its directory) and only notes
+whose mtime or size changed are re-tokenized. Changes found this way
+are passed on to the directory manifests (see manifest).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from collections import Counter
+import json
+import os
+import re
+import logging
+
+from src.utils.helpers import atomic_write_text
+from src.utils.metrics import record_io
+from src.services.manifest import manifests
+from src.services.note_storage import is_note_name, open_note_text, storage_twin
+from configs.search import SCAN_CHUNK_CHARS
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class IndexCorruptError(ValueError):
+    """Raised when the on-disk index cannot be parsed."""
+
+
+@dataclass
+class IndexedDoc:
+    """Metadata recorded for one indexed note."""
+
+    doc_id: int
+    relpath: str
+    mtime_ns: int
+    size: int
+    length: int
+
+
+def iter_tokens(path: Path, chunk_size: int = SCAN_CHUNK_CHARS) -> Iterator[str]:
+    """Yield the lowercased tokens of a note in order, reading it in bounded chunks."""
+    carry = ""
+    with open_note_text(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            tokens = TOKEN_RE.findall(carry + chunk.lower())
+            # The last token may continue in the next chunk
+            carry = tokens.pop() if tokens and TOKEN_RE.match(chunk[-1]) else ""
+            yield from tokens
+    if carry:
+        yield carry
+
+
+def tokenize_file(path: Path, chunk_size: int = SCAN_CHUNK_CHARS) -> Counter:
+    """Return token frequencies of a note, reading it in bounded chunks."""
+    return Counter(iter_tokens(path, chunk_size))
+
+
+class SearchIndex:
+    """Token -> postings index over the notes below a directory."""
+
+    INDEX_FILE_NAME = ".search_index.json"
+    VERSION = 1
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_file = self.directory / self.INDEX_FILE_NAME
+        self._reset()
+
+    def _reset(self) -> None:
+        self.docs: Dict[int, IndexedDoc] = {}
+        self.paths: Dict[str, int] = {}
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.next_id = 0
+        # Sum of all document lengths, for the average used by ranking
+        self.total_length = 0
+        self._vocabulary: Optional[List[str]] = None
+        # (mtime_ns, size) of the index file matching the in-memory state
+        self._file_key: Optional[Tuple[int, int]] = None
+
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.index_file.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def ensure_loaded(self) -> bool:
+        """
+        Load the index unless the in-memory copy is still current.
+
+        Returns:
+            False if no index file exists yet
+        """
+        key = self._stat_key()
+        if key is not None and key == self._file_key:
+            return True
+        return self.load()
+
+    # Persistence
+    def load(self) -> bool:
+        """
+        Load the index from disk.
+
+        Returns:
+            False if no index file exists yet
+
+        Raises:
+            IndexCorruptError: if the file exists but is unreadable
+        """
+        self._reset()
+        key = self._stat_key()
+        try:
+            raw = self.index_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return False
+        record_io(bytes_read=len(raw), files=1)
+        try:
+            data = json.loads(raw)
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+            for doc_id, relpath, mtime_ns, size, length in data["docs"]:
+                self.docs[doc_id] = IndexedDoc(doc_id, relpath, mtime_ns, size, length)
+                self.paths[relpath] = doc_id
+                self.total_length += length
+            self.postings = data["postings"]
+            self.next_id = int(data["next_id"])
+        except (ValueError, KeyError, TypeError) as exc:
+            self._reset()
+            raise IndexCorruptError(f"Corrupt search index {self.index_file}: {exc}") from exc
+        self._file_key = key
+        return True
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        data = {
+            "version": self.VERSION,
+            "next_id": self.next_id,
+            "docs": [
+                [d.doc_id, d.relpath, d.mtime_ns, d.size, d.length]
+                for d in self.docs.values()
+            ],
+            "postings": self.postings,
+        }
+        atomic_write_text(self.index_file, json.dumps(data, separators=(",", ":")))
+        self._file_key = self._stat_key()
+
+    def discard(self) -> None:
+        """Remove the on-disk index so the next refresh rebuilds it."""
+        self._reset()
+        try:
+            self.index_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    # Refresh
+    def _walk_notes(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) for every note below the directory."""
+        stack = [self.directory]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif is_note_name(entry.name) and entry.is_file():
+                    rel = Path(entry.path).relative_to(self.directory).as_posix()
+                    yield rel, entry.stat()
+
+    def refresh(self, persist: bool = True, load: bool = True) -> bool:
+        """
+        Bring the index up to date with the directory.
+
+        Args:
+            persist: Save the updated index (False keeps it in memory only)
+            load: Start from the stored index (False never reads it)
+
+        Returns:
+            True if anything changed
+
+        Raises:
+            IndexCorruptError: if the stored index is corrupt
+        """
+        if load:
+            self.ensure_loaded()
+
+        seen: Set[str] = set()
+        changed: List[Tuple[str, os.stat_result]] = []
+        for rel, st in self._walk_notes():
+            seen.add(rel)
+            doc_id = self.paths.get(rel)
+            if doc_id is None:
+                changed.append((rel, st))
+                continue
+            doc = self.docs[doc_id]
+            if doc.mtime_ns != st.st_mtime_ns or doc.size != st.st_size:
+                changed.append((rel, st))
+
+        removed = {self.paths[rel] for rel in self.paths if rel not in seen}
+        moved = self._move_twins(changed, removed)
+        stale = set(removed)
+        stale.update(self.paths[rel] for rel, _ in changed if rel in self.paths)
+
+        if not changed and not stale and not moved:
+            record_io(files=len(seen))
+            return False
+
+        record_io(files=len(seen), bytes_read=sum(st.st_size for _, st in changed))
+        self._remove_docs(stale)
+        for rel, st in changed:
+            self._add_doc(rel, st)
+        self._vocabulary = None
+        self._sync_manifests(rel for rel, _ in changed)
+
+        if persist:
+            self.save()
+        logger.info(
+            "Search index refreshed: %s (%d updated, %d moved, %d removed)",
+            self.directory, len(changed), moved, len(removed),
+        )
+        return True
+
+    def _sync_manifests(self, rels: Iterator[str]) -> None:
+        """Let the directory manifests catch up with notes changed in place."""
+        by_dir: Dict[Path, List[str]] = {}
+        for rel in rels:
+            path = self.directory / rel
+            by_dir.setdefault(path.parent, []).append(path.name)
+        for directory, names in by_dir.items():
+            manifests.get(directory).check(*names)
+
+    def _move_twins(self, changed: List[Tuple[str, os.stat_result]], removed: Set[int]) -> int:
+        """
+        Re-point entries of notes that were only compressed or decompressed.
+
+        Both storage forms of a note keep its mtime, so a new file whose
+        twin disappeared with the same mtime needs no tokenizing. Moved
+        notes are taken out of changed and removed.
+        """
+        moved = 0
+        for rel, st in list(changed):
+            twin_id = self.paths.get(storage_twin(rel) or "")
+            if rel in self.paths or twin_id not in removed:
+                continue
+            doc = self.docs[twin_id]
+            if doc.mtime_ns != st.st_mtime_ns:
+                continue
+            del self.paths[doc.relpath]
+            doc.relpath, doc.size = rel, st.st_size
+            self.paths[rel] = twin_id
+            removed.discard(twin_id)
+            changed.remove((rel, st))
+            moved += 1
+        return moved
+
+    def _remove_docs(self, doc_ids: Set[int]) -> None:
+        """Drop documents and their postings in one pass."""
+        if not doc_ids:
+            return
+        for doc_id in doc_ids:
+            doc = self.docs.pop(doc_id)
+            del self.paths[doc.relpath]
+            self.total_length -= doc.length
+        for token in list(self.postings):
+            kept = [p for p in self.postings[token] if p[0] not in doc_ids]
+            if kept:
+                self.postings[token] = kept
+            else:
+                del self.postings[token]
+
+    def _add_doc(self, rel: str, st: os.stat_result) -> None:
+        """Tokenize one note and append it to the postings."""
+        try:
+            counts = tokenize_file(self.directory / rel)
+        except (OSError, EOFError):
+            logger.exception("Failed to index note: %s", rel)
+            return
+        doc_id = self.next_id
+        self.next_id += 1
+        length = sum(counts.values())
+        self.docs[doc_id] = IndexedDoc(doc_id, rel, st.st_mtime_ns, st.st_size, length)
+        self.total_length += length
+        self.paths[rel] = doc_id
+        # New ids are always the largest, so appending keeps postings sorted
+        for token, tf in counts.items():
+            self.postings.setdefault(token, []).append([doc_id, tf])
+
+    # Queries
+    @property
+    def average_length(self) -> float:
+        """Average number of tokens per indexed note."""
+        return self.total_length / len(self.docs) if self.docs else 0.0
+
+    def vocabulary(self) -> List[str]:
+        """Return all indexed tokens, sorted (cached until the next change)."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def doc_ids(self, token: str) -> List[int]:
+        """Return the sorted ids of notes containing token."""
+        return [p[0] for p in self.postings.get(token, ())]
+
+    def path_of(self, doc_id: int) -> Path:
+        """Return the absolute path of an indexed note."""
+        return self.directory / self.docs[doc_id].relpath
+
+    def docs_with_substring(self, fragment: str) -> Set[int]:
+        """Return ids of notes containing a token that contains fragment."""
+        found: Set[int] = set()
+        for token, postings in self.postings.items():
+            if fragment in token:
+                found.update(p[0] for p in postings)
+        return found
+
+    def candidates(self, keyword: str) -> Tuple[Set[int], bool]:
+        """
+        Return note ids that may contain keyword.
+
+        Returns:
+            (candidate ids, exact) where exact means no content
+            verification is needed
+        """
+        fragments = TOKEN_RE.findall(keyword)
+        if not fragments:
+            return set(self.docs), False
+
+        result = None
+        for fragment in sorted(set(fragments), key=len, reverse=True):
+            docs = self.docs_with_substring(fragment)
+            result = docs if result is None else result & docs
+            if not result:
+                break
+
+        # A keyword made of word characters only always lies inside one token
+        exact = TOKEN_RE.fullmatch(keyword) is not None
+        return result or set(), exact
@@ -1,17 +1,24 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+import time
 import logging
 
+from src.services.archive import ImportReport
 from src.services.workspace_service import WorkspaceService
 from src.services.notebook_service import NotebookService
 from src.services.note_service import NoteService
 from src.services.task_service import TaskService
+from src.services.trash import TrashEntry, ensure_reaper
 
 from configs.paths import DATA_DIR  
+from configs.search import USER_SEARCH_WORKERS
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 @dataclass(frozen=True)
 class SessionContext:
@@ -27,7 +34,15 @@ class SessionContext:
 
 
 class UserSession:
-    """Session bound to an authenticated user."""
+    """
+    Session bound to an authenticated user.
+
+    Services are built once per workspace and reused for the whole
+    session, so their caches (search indexes, task offsets) stay warm
+    across menus. Deleting a workspace drops its services. A search that
+    outlives search_all's timeout keeps its workspace's services until it
+    finishes; nothing else uses them before then.
+    """
     @property
     def username(self) -> str:
         return self.context.username
@@ -38,8 +53,30 @@ class UserSession:
 
         self.context = SessionContext(username=username)
         self.workspace_svc = WorkspaceService(self.context.user_dir)  
+        self._services: Dict[Tuple[type, str], object] = {}
+        # Workspace -> search still running after search_all timed out
+        self._running: Dict[str, Future] = {}
         logger.info("Session started for user: %s", username)
 
+    def _service(self, kind: Callable[[Path], T], workspace_name: str) -> T:
+        """Return the session's service of a kind for a workspace."""
+        self._await_search(workspace_name)
+        key = (kind, workspace_name)
+        if key not in self._services:
+            self._services[key] = kind(self.context.user_dir / workspace_name)
+        return self._services[key]
+
+    def _await_search(self, workspace_name: str) -> None:
+        """Wait for a timed-out search to stop using a workspace's services."""
+        future = self._running.pop(workspace_name, None)
+        if future is not None:
+            wait([future])
+
+    def invalidate(self, workspace_name: str) -> None:
+        """Forget all services built for a workspace."""
+        for key in [k for k in self._services if k[1] == workspace_name]:
+            del self._services[key]
+
     # Workspace operations 
     def create_workspace(self, name: str) -> Path:
         """Create a workspace for the current user."""
@@ -49,20 +86,118 @@ class UserSession:
         """List all workspaces for the current user."""
         return self.workspace_svc.list_workspaces()
 
+    def suggest_workspaces(self, query: str) -> List[str]:
+        """Return the current user's workspaces matching a partial name."""
+        return self.workspace_svc.suggest_workspaces(query)
+
     def delete_workspace(self, name: str) -> None:
         """Delete a workspace for the current user."""
-        return self.workspace_svc.delete_workspace(name)
+        self.workspace_svc.delete_workspace(name)
+        self.invalidate(name)
+
+    def start_trash_reaper(self) -> None:
+        """Purge expired trash entries in the background while the app runs."""
+        ensure_reaper(self.workspace_svc.trash)
+
+    def deleted_items(self) -> List[TrashEntry]:
+        """List the current user's deleted workspaces and notebooks."""
+        return self.workspace_svc.deleted_items()
+
+    def restore_deleted(self, entry_id: str) -> Path:
+        """Restore a deleted workspace or notebook of the current user."""
+        return self.workspace_svc.restore_deleted(entry_id)
+
+    def export_workspace(self, name: str, archive_path: Path) -> int:
+        """Write one of the current user's workspaces to an archive."""
+        return self.workspace_svc.export_workspace(name, archive_path)
+
+    def import_workspace(
+        self, archive_path: Path, name: Optional[str] = None, skip_unchanged: bool = True
+    ) -> ImportReport:
+        """Restore a workspace of the current user from an archive."""
+        report = self.workspace_svc.import_workspace(archive_path, name, skip_unchanged)
+        self.invalidate(report.workspace)
+        return report
 
     # Services
     def notebook_service_for(self, workspace_name: str) -> NotebookService:
-        workspace_path = self.context.user_dir / workspace_name
-        return NotebookService(workspace_path)
+        return self._service(NotebookService, workspace_name)
 
     def note_service_for(self, workspace_name: str) -> NoteService:
-        workspace_path = self.context.user_dir / workspace_name
-        return NoteService(workspace_path)
+        return self._service(NoteService, workspace_name)
 
     def task_service_for(self, workspace_name: str) -> TaskService:
-        workspace_path = self.context.user_dir / workspace_name
-        return TaskService(workspace_path)  
-
+        return self._service(TaskService, workspace_name)
+
+    # Search
+    def search_all(
+        self,
+        keyword: str,
+        timeout: Optional[float] = None,
+        limit: Optional[int] = None,
+        max_workers: int = USER_SEARCH_WORKERS,
+    ) -> Iterator[Path]:
+        """
+        Search every workspace of the user concurrently.
+
+        Workspaces are searched on a thread pool with the session's
+        NoteServices, so each workspace's search index is reused. Matches
+        are yielded per workspace as soon as its search finishes. Scans
+        run serially in each thread (no process pools are started there).
+
+        Args:
+            timeout: Seconds of waiting for results after which workspaces
+                still searching are skipped (None waits for all). Time the
+                caller spends between two matches does not count.
+            limit: Maximum number of matches to yield (None for all)
+        """
+        workspaces = self.list_workspaces()
+        if not workspaces:
+            return
+        # Searches left running by an earlier timeout are waited for in the
+        # pool, so this call's timeout still applies
+        previous = {ws: self._running.pop(ws, None) for ws in workspaces}
+        services = {ws: self.note_service_for(ws) for ws in workspaces}
+
+        def search(ws: str) -> List[Path]:
+            if previous[ws] is not None:
+                wait([previous[ws]])
+            return services[ws].search_notes(keyword, max_workers=1)
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(workspaces)), thread_name_prefix="search"
+        )
+        found = 0
+        futures: Dict[Future, str] = {}
+        try:
+            futures = {pool.submit(search, ws): ws for ws in workspaces}
+            pending = set(futures)
+            waited = 0.0
+            while pending:
+                remaining = None if timeout is None else max(timeout - waited, 0)
+                started = time.monotonic()
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                waited += time.monotonic() - started
+                if not done:
+                    logger.warning("Search timed out after %ss, results are partial: %s", timeout, keyword)
+                    return
+                for future in done:
+                    try:
+                        matches = future.result()
+                    except Exception:
+                        logger.exception("Search failed in workspace: %s", futures[future])
+                        continue
+                    for path in matches:
+                        yield path
+                        found += 1
+                        if limit is not None and found >= limit:
+                            return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            # Remember what is still using the services (a cancelled search
+            # leaves the earlier one it was waiting for)
+            current = {ws: future for future, ws in futures.items()}
+            for ws in workspaces:
+                busy = [f for f in (current.get(ws), previous[ws]) if f is not None and not f.done()]
+                if busy:
+                    self._running[ws] = busy[0]
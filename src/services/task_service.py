@@ -2,17 +2,58 @@
 Task management service.
 """
 
+from array import array
 from pathlib import Path
-from typing import List
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
 
-from src.utils.helpers import open_file_cross_platform
+from src.utils.helpers import atomic_write_text, open_file_cross_platform
+from src.utils.metrics import record_io, timed
 
 logger = logging.getLogger(__name__)
 
 
+def parse_task_selection(spec: str, total: int) -> Set[int]:
+    """
+    Parse a task selection such as "3,5,10-40" into 1-based indices.
+
+    Raises:
+        ValueError: if the selection is malformed
+        IndexError: if a number is outside 1..total
+    """
+    indices: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        try:
+            lo = int(start)
+            hi = int(end) if sep else lo
+        except ValueError:
+            raise ValueError(f"Invalid task selection: {part}") from None
+        if lo > hi:
+            raise ValueError(f"Invalid task range: {part}")
+        if lo < 1 or hi > total:
+            raise IndexError("Invalid task number")
+        indices.update(range(lo, hi + 1))
+    if not indices:
+        raise ValueError("No tasks selected")
+    return indices
+
+
 class TaskService:
-    """Manage tasks stored in a single tasks.txt file inside a directory."""
+    """
+    Manage tasks stored in a single tasks.txt file inside a directory.
+
+    Toggling rewrites one byte in place: "[ ]" and "[x]" have the same
+    width, so the checkbox of task N sits at a fixed offset. Line start
+    offsets are cached and revalidated against the file's size and mtime.
+
+    Tasks are separated by "\n" only, in every method, so a task holding
+    another line break character (\r, \x0c, U+2028, ...) keeps one number.
+    """
 
     TASK_FILE_NAME = "tasks.txt"
 
@@ -20,6 +61,28 @@ class TaskService:
         # IMPORTANT: no side effects here
         self.base_dir = Path(base_dir)
         self.task_file = self.base_dir / self.TASK_FILE_NAME
+        self._offsets: Optional[array] = None
+        self._offsets_key: Optional[Tuple[int, int]] = None
+
+    def _file_key(self) -> Tuple[int, int]:
+        st = self.task_file.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def _line_offsets(self) -> array:
+        """Return the byte offset of every task line, rebuilding if stale."""
+        key = self._file_key()
+        if self._offsets is not None and self._offsets_key == key:
+            return self._offsets
+
+        offsets = array("Q")
+        pos = 0
+        with self.task_file.open("rb") as f:
+            for line in f:
+                offsets.append(pos)
+                pos += len(line)
+        record_io(bytes_read=pos, files=1)
+        self._offsets, self._offsets_key = offsets, key
+        return offsets
 
     def _ensure_task_file(self) -> None:
         """Ensure the task file exists."""
@@ -27,58 +90,173 @@ class TaskService:
         if not self.task_file.exists():
             self.task_file.touch()
 
+    @timed()
     def create_task(self, task: str) -> None:
         """Add a new unchecked task."""
         if not task.strip():
             raise ValueError("Task cannot be empty")
 
         self._ensure_task_file()
+        start = self._file_key()[0]
+        cached = self._offsets is not None and self._offsets_key == self._file_key()
+        if cached and start > 0:
+            with self.task_file.open("rb") as f:
+                f.seek(start - 1)
+                cached = f.read(1) == b"\n"
 
         with self.task_file.open("a", encoding="utf-8") as f:
             f.write(f"[ ] {task.strip()}\n")
 
+        # Extend a valid offset cache instead of rebuilding it
+        if cached:
+            self._offsets.append(start)
+            self._offsets_key = self._file_key()
+
         logger.info("Task added")
 
+    @timed()
     def list_tasks(self) -> List[str]:
         """List all tasks."""
         if not self.task_file.exists():
             return []
 
-        return self.task_file.read_text(encoding="utf-8").splitlines()
+        with self.task_file.open(encoding="utf-8", newline="\n") as f:
+            lines = f.readlines()
+        record_io(bytes_read=sum(map(len, lines)), files=1)
+        return [line.rstrip("\r\n") for line in lines]
 
+    def iter_tasks(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Stream (number, task) pairs in file order without reading the whole file.
+
+        Args:
+            offset: Number of tasks to skip
+            limit: Maximum number of tasks to yield (None for all)
+        """
+        if not self.task_file.exists():
+            return
+        stop = None if limit is None else offset + limit
+        with self.task_file.open(encoding="utf-8", newline="\n") as f:
+            lines = (line.rstrip("\r\n") for line in f)
+            yield from islice(enumerate(lines, start=1), offset, stop)
+
+    @timed()
     def toggle_task(self, index: int) -> None:
-        """Toggle task checkbox."""
+        """Toggle task checkbox in place."""
         self._ensure_task_file()
-        tasks = self.list_tasks()
+        offsets = self._line_offsets()
 
-        if not tasks:
+        if not offsets:
             raise ValueError("No tasks found")
 
-        if index < 1 or index > len(tasks):
+        if index < 1 or index > len(offsets):
             raise IndexError("Invalid task number")
 
-        line = tasks[index - 1]
+        offset = offsets[index - 1]
+        with self.task_file.open("r+b") as f:
+            f.seek(offset)
+            box = f.read(3)
+            if box == b"[ ]":
+                mark = b"x"
+            elif box == b"[x]":
+                mark = b" "
+            else:
+                return
+            f.seek(offset + 1)
+            f.write(mark)
 
-        if line.startswith("[ ]"):
-            tasks[index - 1] = line.replace("[ ]", "[x]", 1)
-        elif line.startswith("[x]"):
-            tasks[index - 1] = line.replace("[x]", "[ ]", 1)
-
-        self.task_file.write_text("\n".join(tasks) + "\n", encoding="utf-8")
+        # Size is unchanged, so the cached offsets stay valid
+        self._offsets_key = self._file_key()
 
+    @timed()
     def delete_task(self, index: int) -> None:
         """Delete a task by index."""
+        self.delete_tasks([index])
+
+    def _rewrite_tasks(self, edit: Callable[[List[str]], List[str]]) -> None:
+        """Apply edit to all tasks in one read-modify-write pass."""
         self._ensure_task_file()
         tasks = self.list_tasks()
 
         if not tasks:
             raise ValueError("No tasks found")
 
-        if index < 1 or index > len(tasks):
+        tasks = edit(tasks)
+        atomic_write_text(self.task_file, "".join(f"{t}\n" for t in tasks))
+
+    @staticmethod
+    def _check_indices(indices: Set[int], total: int) -> None:
+        if not indices:
+            raise ValueError("No tasks selected")
+        if min(indices) < 1 or max(indices) > total:
             raise IndexError("Invalid task number")
 
-        tasks.pop(index - 1)
-        self.task_file.write_text("\n".join(tasks) + "\n", encoding="utf-8")
+    @timed()
+    def toggle_tasks(self, indices: Iterable[int]) -> int:
+        """
+        Toggle several task checkboxes with a single rewrite.
+
+        Returns:
+            Number of tasks toggled
+        """
+        indices = set(indices)
+        toggled = 0
+
+        def edit(tasks: List[str]) -> List[str]:
+            nonlocal toggled
+            self._check_indices(indices, len(tasks))
+            for i in indices:
+                line = tasks[i - 1]
+                if line.startswith("[ ]"):
+                    tasks[i - 1] = "[x]" + line[3:]
+                elif line.startswith("[x]"):
+                    tasks[i - 1] = "[ ]" + line[3:]
+                else:
+                    continue
+                toggled += 1
+            return tasks
+
+        self._rewrite_tasks(edit)
+        logger.info("Tasks toggled: %d", toggled)
+        return toggled
+
+    @timed()
+    def delete_tasks(self, indices: Iterable[int]) -> int:
+        """
+        Delete several tasks with a single rewrite.
+
+        Returns:
+            Number of tasks deleted
+        """
+        indices = set(indices)
+
+        def edit(tasks: List[str]) -> List[str]:
+            self._check_indices(indices, len(tasks))
+            return [t for i, t in enumerate(tasks, start=1) if i not in indices]
+
+        self._rewrite_tasks(edit)
+        logger.info("Tasks deleted: %d", len(indices))
+        return len(indices)
+
+    @timed()
+    def delete_completed(self) -> int:
+        """
+        Delete all checked tasks with a single rewrite.
+
+        Returns:
+            Number of tasks deleted
+        """
+        deleted = 0
+
+        def edit(tasks: List[str]) -> List[str]:
+            nonlocal deleted
+            kept = [t for t in tasks if not t.startswith("[x]")]
+            deleted = len(tasks) - len(kept)
+            return kept
+
+        self._rewrite_tasks(edit)
+        logger.info("Completed tasks deleted: %d", deleted)
+        return deleted
 
     def open_task_file(self) -> None:
         """Open the task file in editor."""
@@ -0,0 +1,202 @@
+"""
+Per-user trash for deleted workspaces and notebooks.
+
+Deleting moves the directory into the user's hidden .trash folder with
+a single rename, however many files it holds, and records where it came
+from next to it:
+
+    .trash/<id>/        the deleted directory
+    .trash/<id>.json    {"kind": ..., "origin": ..., "deleted_at": ...}
+
+Entries can be restored until TRASH_RETENTION_DAYS have passed. In the
+interactive app a background reaper thread then removes them; one-shot
+commands purge expired entries themselves (purge()).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
+import json
+import os
+import secrets
+import shutil
+import threading
+import time
+import logging
+
+from src.utils.helpers import atomic_write_text
+from src.utils.listing import listing_cache
+from configs.storage import TRASH_DIR_NAME, TRASH_REAP_INTERVAL, TRASH_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TrashEntry:
+    """One deleted workspace or notebook."""
+
+    id: str
+    kind: str
+    origin: str
+    deleted_at: float
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.origin).name
+
+
+class Trash:
+    """Trash folder of one user directory."""
+
+    def __init__(self, user_dir: Path, retention_days: float = TRASH_RETENTION_DAYS):
+        self.user_dir = Path(user_dir)
+        self.root = self.user_dir / TRASH_DIR_NAME
+        self.retention = retention_days * 86400
+
+    def _meta_path(self, entry_id: str) -> Path:
+        return self.root / f"{entry_id}.json"
+
+    def move(self, path: Path, kind: str) -> TrashEntry:
+        """
+        Move a directory below the user directory into the trash.
+
+        Raises:
+            FileNotFoundError: if path does not exist
+            ValueError: if path is not inside the user directory
+        """
+        path = Path(path)
+        try:
+            origin = path.relative_to(self.user_dir).as_posix()
+        except ValueError:
+            raise ValueError(f"Not inside {self.user_dir}: {path}") from None
+        if origin == "." or origin.split("/")[0] == TRASH_DIR_NAME:
+            raise ValueError(f"Cannot move to trash: {path}")
+
+        entry = TrashEntry(
+            id=f"{time.strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(3)}",
+            kind=kind, origin=origin, deleted_at=time.time(),
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Record first: a directory without a record is treated as reapable
+        meta = self._meta_path(entry.id)
+        atomic_write_text(meta, json.dumps({"kind": kind, "origin": origin, "deleted_at": entry.deleted_at}))
+        try:
+            os.rename(path, self.root / entry.id)
+        except BaseException:
+            meta.unlink()
+            raise
+        listing_cache.invalidate(path.parent)
+        logger.info("Moved to trash: %s (%s)", path, entry.id)
+        return entry
+
+    def entries(self) -> List[TrashEntry]:
+        """Return entries that can still be restored, newest first."""
+        entries = []
+        for meta in self.root.glob("*.json"):
+            try:
+                data = json.loads(meta.read_text(encoding="utf-8"))
+                entries.append(TrashEntry(id=meta.stem, **data))
+            except (OSError, ValueError, TypeError) as exc:
+                logger.warning("Skipping unreadable trash record: %s (%s)", meta, exc)
+        return sorted(entries, key=lambda e: e.deleted_at, reverse=True)
+
+    def get(self, entry_id: str) -> TrashEntry:
+        """
+        Return an entry by id.
+
+        Raises:
+            FileNotFoundError: if there is no such entry
+        """
+        for entry in self.entries():
+            if entry.id == entry_id:
+                return entry
+        raise FileNotFoundError(f"Not in trash: {entry_id}")
+
+    def expires_at(self, entry: TrashEntry) -> float:
+        return entry.deleted_at + self.retention
+
+    def restore(self, entry_id: str) -> Path:
+        """
+        Move an entry back to where it was deleted from.
+
+        Raises:
+            FileNotFoundError: if the entry or its parent no longer exists
+            FileExistsError: if something was created under its name since
+        """
+        entry = self.get(entry_id)
+        target = self.user_dir / entry.origin
+        if not target.parent.is_dir():
+            raise FileNotFoundError(f"Parent of {entry.origin} no longer exists")
+        if target.exists():
+            raise FileExistsError(f"{entry.origin} already exists")
+        os.rename(self.root / entry.id, target)
+        try:
+            self._meta_path(entry.id).unlink()
+        except FileNotFoundError:
+            pass
+        listing_cache.invalidate(target.parent)
+        logger.info("Restored from trash: %s (%s)", target, entry.id)
+        return target
+
+    def purge(self, entry_id: Optional[str] = None, expired_only: bool = True) -> int:
+        """
+        Permanently remove one entry, expired entries, or (expired_only=False) all.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        if entry_id is not None:
+            doomed = [self.get(entry_id).id]
+        else:
+            doomed = [e.id for e in self.entries() if not expired_only or self.expires_at(e) <= now]
+        # Directories left without a record (interrupted purge or move) go too
+        if entry_id is None and self.root.is_dir():
+            doomed += [
+                p.name for p in self.root.iterdir()
+                if p.is_dir() and not self._meta_path(p.name).exists()
+            ]
+        for doomed_id in doomed:
+            # Drop the record first so the entry cannot be restored half-removed
+            try:
+                self._meta_path(doomed_id).unlink()
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(self.root / doomed_id, ignore_errors=True)
+            logger.info("Purged from trash: %s", doomed_id)
+        return len(doomed)
+
+
+class _Reaper(threading.Thread):
+    """Daemon thread purging a trash's expired entries periodically."""
+
+    def __init__(self, trash: Trash, interval: float):
+        super().__init__(name=f"trash-reaper-{trash.user_dir.name}", daemon=True)
+        self.trash = trash
+        self.interval = interval
+        self.wakeup = threading.Event()
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.trash.purge()
+            except OSError:
+                logger.exception("Trash reaping failed: %s", self.trash.root)
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+
+
+_reapers: Dict[str, _Reaper] = {}
+_reapers_lock = threading.Lock()
+
+
+def ensure_reaper(trash: Trash, interval: float = TRASH_REAP_INTERVAL) -> None:
+    """Start the reaper of a trash unless it is already running, and wake it."""
+    key = os.fspath(trash.root)
+    with _reapers_lock:
+        reaper = _reapers.get(key)
+        if reaper is None or not reaper.is_alive():
+            reaper = _reapers[key] = _Reaper(trash, interval)
+            reaper.start()
+            return
+    reaper.wakeup.set()
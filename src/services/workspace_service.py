@@ -1,8 +1,13 @@
 from pathlib import Path
-import shutil
-from typing import List
+from typing import Iterator, List, Optional
 import logging
 
+from src.services.archive import ImportReport, export_directory, import_archive
+from src.services.trash import Trash, TrashEntry
+from src.utils.listing import iter_sorted, listing_cache
+from src.utils.name_index import name_index
+from src.utils.metrics import timed
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,7 +17,9 @@ class WorkspaceService:
     def __init__(self, user_dir: Path):
         self.user_dir = user_dir
         self.user_dir.mkdir(parents=True, exist_ok=True)  
+        self.trash = Trash(user_dir)
 
+    @timed()
     def create_workspace(self, name: str) -> Path:
         if not name.strip():
             raise ValueError("Workspace name must not be empty")
@@ -20,15 +27,95 @@ class WorkspaceService:
         if workspace_path.exists():
             raise FileExistsError("Workspace exists")
         workspace_path.mkdir(parents=True)
+        listing_cache.invalidate(self.user_dir)
         logger.info("Workspace created: %s", workspace_path)
         return workspace_path
     
+    @timed()
     def list_workspaces(self) -> List[str]:
-        return [p.name for p in self.user_dir.iterdir() if p.is_dir()]
+        return list(self.iter_workspaces())
+
+    def iter_workspaces(
+        self,
+        sort: str = "name",
+        reverse: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield workspace names sorted by name, mtime or size, with paging."""
+        names = listing_cache.dirs(self.user_dir)
+        return iter_sorted(self.user_dir, names, sort, reverse, offset, limit)
 
+    @timed()
+    def suggest_workspaces(self, query: str, limit: int = 5) -> List[str]:
+        """Return workspace names matching a partial or misspelled name."""
+        return name_index.dirs(self.user_dir).lookup(query, limit)
+
+    @timed()
     def delete_workspace(self, name: str) -> None:
+        """Move a workspace to the trash (restorable for a while)."""
+        workspace_path = self.user_dir / name
+        if not name.strip() or not workspace_path.is_dir():
+            raise FileNotFoundError("Workspace not found")
+        self.trash.move(workspace_path, "workspace")
+        logger.info("Workspace deleted: %s", workspace_path)
+
+    def deleted_items(self) -> List[TrashEntry]:
+        """Return deleted workspaces and notebooks that can be restored, newest first."""
+        return self.trash.entries()
+
+    @timed()
+    def restore_deleted(self, entry_id: str) -> Path:
+        """
+        Restore a deleted workspace or notebook from the trash.
+
+        Raises:
+            FileNotFoundError: if the entry (or its workspace) is gone
+            FileExistsError: if its name has been taken since
+        """
+        return self.trash.restore(entry_id)
+
+    @timed()
+    def purge_deleted(self, entry_id: Optional[str] = None, expired_only: bool = True) -> int:
+        """Permanently remove a trash entry, or expired (or all) entries."""
+        return self.trash.purge(entry_id, expired_only)
+
+    @timed()
+    def export_workspace(self, name: str, archive_path: Path) -> int:
+        """
+        Write a workspace to a compressed archive.
+
+        Returns:
+            Number of files archived
+        """
         workspace_path = self.user_dir / name
-        if not workspace_path.exists():
+        if not workspace_path.is_dir():
             raise FileNotFoundError("Workspace not found")
-        shutil.rmtree(workspace_path)
-        logger.info("Workspace deleted: %s", workspace_path)    
\ No newline at end of file
+        with open(archive_path, "wb") as f:
+            files = export_directory(workspace_path, f, workspace_path.name)
+        logger.info("Workspace exported: %s -> %s (%d files)", workspace_path, archive_path, files)
+        return files
+
+    @timed()
+    def import_workspace(
+        self,
+        archive_path: Path,
+        name: Optional[str] = None,
+        skip_unchanged: bool = True,
+    ) -> ImportReport:
+        """
+        Restore a workspace from an archive, merging into it if it exists.
+
+        Raises:
+            ArchiveError: if the archive is unsafe or fails verification
+        """
+        if name is not None and not name.strip():
+            raise ValueError("Workspace name must not be empty")
+        with open(archive_path, "rb") as f:
+            report = import_archive(f, self.user_dir, name and name.strip(), skip_unchanged)
+        listing_cache.invalidate(self.user_dir)
+        logger.info(
+            "Workspace imported: %s -> %s (%d written, %d unchanged)",
+            archive_path, report.workspace, report.written, report.skipped,
+        )
+        return report
@@ -0,0 +1,20 @@
+"""
+User-facing console output.
+
+Menu text goes straight to stdout/stderr instead of through the logging
+framework, so UI output never waits on log handlers and log files only
+contain application events.
+"""
+
+import sys
+
+
+def echo(message: str = "", *args) -> None:
+    """Write a line to stdout (printf-style args, like logging)."""
+    sys.stdout.write((message % args if args else message) + "\n")
+
+
+def echo_error(message: str, *args) -> None:
+    """Write an error line to stderr (printf-style args, like logging)."""
+    sys.stdout.flush()
+    sys.stderr.write((message % args if args else message) + "\n")
@@ -3,9 +3,12 @@ Reusable helper utilities.
 """
 
 import os
+import stat
 import sys
 import subprocess
+import tempfile
 import logging
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,30 @@ def safe_input(prompt: str) -> str:
         logger.error("Input stream closed")
         raise
 
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to path atomically via a temp file and rename."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write bytes to path atomically via a temp file and rename."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file 0600; keep the permissions of the file replaced
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 def open_file_cross_platform(path: str) -> None:
     """Open a file using the default system application (silently)."""
     if not os.path.exists(path):
@@ -0,0 +1,131 @@
+"""
+Cached directory listings.
+
+Listings are built with os.scandir (no extra stat per entry) and cached
+per directory, keyed by the directory's mtime. Listing an unchanged
+directory again costs a single stat.
+
+A directory modified within RACY_WINDOW_NS of being listed is not
+trusted, because a second change in the same timestamp tick would not
+move its mtime.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import os
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class EntryInfo:
+    """One directory entry."""
+
+    name: str
+    is_dir: bool
+    is_file: bool
+
+
+class DirectoryListingCache:
+    """LRU cache of directory listings validated by directory mtime."""
+
+    RACY_WINDOW_NS = 1_000_000_000
+
+    def __init__(self, max_dirs: int = 1024):
+        self.max_dirs = max_dirs
+        self._cache: "OrderedDict[str, Tuple[int, Tuple[EntryInfo, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def entries(self, directory: Path) -> Tuple[EntryInfo, ...]:
+        """Return the entries of a directory (empty if it does not exist)."""
+        key = os.fspath(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            self.invalidate(directory)
+            return ()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == mtime_ns:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        listed_at = time.time_ns()
+        with os.scandir(key) as it:
+            entries = tuple(
+                EntryInfo(e.name, e.is_dir(), e.is_file()) for e in it
+            )
+
+        if listed_at - mtime_ns > self.RACY_WINDOW_NS:
+            with self._lock:
+                self._cache[key] = (mtime_ns, entries)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_dirs:
+                    self._cache.popitem(last=False)
+        return entries
+
+    def dirs(self, directory: Path) -> List[str]:
+        """Return names of visible subdirectories."""
+        return [e.name for e in self.entries(directory) if e.is_dir and not e.name.startswith(".")]
+
+    def files(self, directory: Path, suffix: Union[str, Tuple[str, ...]] = "") -> List[str]:
+        """Return names of files ending with suffix (or one of several)."""
+        return [e.name for e in self.entries(directory) if e.is_file and e.name.endswith(suffix)]
+
+    def invalidate(self, directory: Path) -> None:
+        """Forget the cached listing of a directory."""
+        with self._lock:
+            self._cache.pop(os.fspath(directory), None)
+
+
+SORT_KEYS = ("name", "mtime", "size")
+
+
+def iter_sorted(
+    directory: Path,
+    names: Iterable[str],
+    sort: str = "name",
+    reverse: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    meta: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> Iterator[str]:
+    """
+    Yield names of entries in directory in a stable order, one page at a time.
+
+    Args:
+        sort: "name", "mtime" or "size" (ties are ordered by name)
+        offset: Number of entries to skip
+        limit: Maximum number of entries to yield (None for all)
+        meta: Known (mtime_ns, size) by name, used instead of stat'ing
+
+    Raises:
+        ValueError: if sort is unknown
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+
+    if sort == "name":
+        ordered = sorted(names, reverse=reverse)
+    else:
+        def key(name: str) -> Tuple[int, str]:
+            if meta is not None and name in meta:
+                return meta[name][0 if sort == "mtime" else 1], name
+            try:
+                st = os.stat(os.path.join(directory, name))
+            except FileNotFoundError:
+                return 0, name
+            return (st.st_mtime_ns if sort == "mtime" else st.st_size), name
+
+        ordered = sorted(names, key=key, reverse=reverse)
+
+    stop = None if limit is None else offset + limit
+    return islice(ordered, offset, stop)
+
+
+# Shared by all services so every menu sees the same warm listings
+listing_cache = DirectoryListingCache()
@@ -1,38 +1,78 @@
 """
 Centralized logging configuration.
+
+Records are handed to a background thread through a queue
+(QueueHandler/QueueListener), so code that logs never waits on file or
+console I/O. Menu output does not go through logging at all; see
+src.utils.console.
 """
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from configs.paths import LOG_FILE  
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from configs.paths import LOG_FILE
+from configs.logs import CONSOLE_LOG_LEVEL, LOG_BACKUP_COUNT, LOG_LEVEL, LOG_MAX_BYTES
+
+_listener: Optional[QueueListener] = None
 
-def configure_logging(level: int = logging.INFO) -> None:
+
+def configure_logging(
+    level: int = LOG_LEVEL,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+    console_level: int = CONSOLE_LOG_LEVEL,
+) -> None:
     """
-    Configure root logger with console and rotating file handlers.
+    Configure the root logger to log through a background queue listener.
+
+    Args:
+        level: Minimum level recorded
+        max_bytes: Log file size that triggers rotation
+        backup_count: Rotated log files to keep
+        console_level: Minimum level also echoed to stderr
     """
+    global _listener
     root = logging.getLogger()
     if root.handlers:
-        return  
+        return
 
     formatter = logging.Formatter(
         "%(asctime)s %(levelname)s %(name)s: %(message)s",
         "%Y-%m-%d %H:%M:%S",
     )
 
-    # Console handler
+    # Console handler (warnings and errors only; UI output uses console.echo)
     console = logging.StreamHandler()
     console.setFormatter(formatter)
-    root.setLevel(level)
-    root.addHandler(console)
+    console.setLevel(console_level)
 
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)  
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     # File handler
     file_handler = RotatingFileHandler(
         LOG_FILE,
-        maxBytes=5_000,
-        backupCount=3,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
         encoding="utf-8",
+        delay=True,
     )
     file_handler.setFormatter(formatter)
-    root.addHandler(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, console, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
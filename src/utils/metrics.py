@@ -0,0 +1,198 @@
+"""
+Lightweight per-operation metrics.
+
+Service methods decorated with @timed() record call counts, errors and
+a latency histogram. Code running inside a timed call can attribute
+bytes read and files touched to it with record_io().
+
+Snapshots can be exported as JSON or Prometheus text format:
+    metrics.write(Path("logs/metrics.prom"))
+    metrics.write(Path("logs/metrics.json"))
+
+start_exporter() rewrites the file periodically (and at exit) so a
+local scraper can collect it.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+import atexit
+import json
+import logging
+import threading
+import time
+
+from src.utils.helpers import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_operation: ContextVar[Optional[str]] = ContextVar("current_operation", default=None)
+
+
+@dataclass
+class OperationStats:
+    """Accumulated metrics of one operation."""
+
+    calls: int = 0
+    errors: int = 0
+    seconds_total: float = 0.0
+    bytes_read: int = 0
+    files_touched: int = 0
+    # Non-cumulative counts per bucket, plus one overflow bucket
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+class MetricsRegistry:
+    """Thread-safe store of operation metrics."""
+
+    def __init__(self):
+        self._ops: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> OperationStats:
+        stats = self._ops.get(name)
+        if stats is None:
+            stats = self._ops[name] = OperationStats()
+        return stats
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one call of an operation."""
+        slot = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                slot = i
+                break
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.seconds_total += seconds
+            stats.buckets[slot] += 1
+
+    def record_io(self, bytes_read: int = 0, files: int = 0, name: Optional[str] = None) -> None:
+        """Attribute I/O to an operation (by default the current timed call)."""
+        name = name or _current_operation.get()
+        if name is None:
+            return
+        with self._lock:
+            stats = self._stats(name)
+            stats.bytes_read += bytes_read
+            stats.files_touched += files
+
+    def reset(self) -> None:
+        """Forget all recorded metrics."""
+        with self._lock:
+            self._ops.clear()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return all metrics as plain data (JSON serializable)."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "seconds_total": s.seconds_total,
+                    "bytes_read": s.bytes_read,
+                    "files_touched": s.files_touched,
+                    "latency_buckets": {
+                        **{str(b): c for b, c in zip(LATENCY_BUCKETS, s.buckets)},
+                        "+Inf": s.buckets[-1],
+                    },
+                }
+                for name, s in sorted(self._ops.items())
+            }
+
+    def to_prometheus(self) -> str:
+        """Render metrics in Prometheus text exposition format."""
+        lines = [
+            "# TYPE notes_operation_seconds histogram",
+            "# TYPE notes_operation_errors_total counter",
+            "# TYPE notes_operation_bytes_read_total counter",
+            "# TYPE notes_operation_files_touched_total counter",
+        ]
+        for name, s in self.snapshot().items():
+            label = f'operation="{name}"'
+            cumulative = 0
+            for bound, count in s["latency_buckets"].items():
+                cumulative += count
+                lines.append(f'notes_operation_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"notes_operation_seconds_sum{{{label}}} {s['seconds_total']}")
+            lines.append(f"notes_operation_seconds_count{{{label}}} {s['calls']}")
+            lines.append(f"notes_operation_errors_total{{{label}}} {s['errors']}")
+            lines.append(f"notes_operation_bytes_read_total{{{label}}} {s['bytes_read']}")
+            lines.append(f"notes_operation_files_touched_total{{{label}}} {s['files_touched']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Write a snapshot atomically: JSON for *.json, Prometheus text otherwise."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            atomic_write_text(path, json.dumps(self.snapshot(), indent=2))
+        else:
+            atomic_write_text(path, self.to_prometheus())
+
+
+metrics = MetricsRegistry()
+
+
+def record_io(bytes_read: int = 0, files: int = 0) -> None:
+    """Attribute I/O to the timed operation currently running."""
+    metrics.record_io(bytes_read, files)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator recording call count, errors and latency of a function."""
+
+    def decorate(func: F) -> F:
+        op_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_operation.set(op_name)
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                metrics.observe(op_name, time.perf_counter() - start, error)
+                _current_operation.reset(token)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def start_exporter(path: Path, interval: float) -> threading.Event:
+    """
+    Write metrics to path every interval seconds and once more at exit.
+
+    Returns:
+        Event that stops the exporter when set
+    """
+    stop = threading.Event()
+
+    def export() -> None:
+        try:
+            metrics.write(path)
+        except OSError:
+            logger.exception("Failed to export metrics: %s", path)
+
+    def loop() -> None:
+        while not stop.wait(interval):
+            export()
+
+    threading.Thread(target=loop, name="metrics-exporter", daemon=True).start()
+    atexit.register(export)
+    atexit.register(stop.set)
+    return stop
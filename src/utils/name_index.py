@@ -0,0 +1,138 @@
+"""
+Trigram index over entry names for substring and typo-tolerant lookup.
+
+Names are normalized (lower case, "_" as space, suffix removed) and
+split into padded trigrams. A query only looks at the names sharing a
+trigram with it, so lookups stay fast on very large directories.
+
+Indexes are cached per directory and rebuilt only when the directory's
+cached listing changes.
+
+Usage:
+    name_index.files(directory, ".txt").lookup("meting")   # ["Meeting_notes.txt"]
+"""
+
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import heapq
+import os
+import threading
+
+from src.utils.listing import EntryInfo, listing_cache
+
+# Jaccard similarity of trigram sets below which a name is not suggested
+MIN_SIMILARITY = 0.2
+
+
+def _normalize(name: str, suffixes: Tuple[str, ...] = ()) -> str:
+    for suffix in suffixes:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return name.strip().lower().replace("_", " ")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the trigrams of text, padded so word starts and ends count."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Trigram postings over a fixed list of names."""
+
+    def __init__(self, names: Sequence[str], suffixes: Tuple[str, ...] = ()):
+        self.names = list(names)
+        self.suffixes = suffixes
+        self._keys = [_normalize(n, suffixes) for n in self.names]
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for i, key in enumerate(self._keys):
+            grams = trigrams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def lookup(self, query: str, limit: int = 5, min_similarity: float = MIN_SIMILARITY) -> List[str]:
+        """
+        Return up to limit names matching query, best first.
+
+        Exact matches come first, then prefix and substring matches,
+        then names whose trigram similarity is at least min_similarity.
+        Queries need at least two characters, and two only match at word starts.
+        """
+        q = _normalize(query, self.suffixes)
+        if not q:
+            return []
+        q_grams = trigrams(q)
+        shared: Counter = Counter()
+        for gram in q_grams:
+            for i in self._postings.get(gram, ()):
+                shared[i] += 1
+
+        ranked: List[Tuple[int, float, str]] = []
+        for i, common in shared.items():
+            key = self._keys[i]
+            similarity = common / (len(q_grams) + self._sizes[i] - common)
+            if key == q:
+                tier = 0
+            elif key.startswith(q):
+                tier = 1
+            elif q in key:
+                tier = 2
+            elif similarity >= min_similarity:
+                tier = 3
+            else:
+                continue
+            ranked.append((tier, -similarity, self.names[i]))
+        return [name for _, _, name in heapq.nsmallest(limit, ranked)]
+
+
+class NameIndexCache:
+    """Per-directory trigram indexes, validated against the listing cache."""
+
+    def __init__(self, max_dirs: int = 256):
+        self.max_dirs = max_dirs
+        # (directory, suffixes or None for dirs) -> (listing it was built from, index)
+        self._cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[Tuple[EntryInfo, ...], TrigramIndex]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _get(self, directory: Path, suffixes: Optional[Tuple[str, ...]]) -> TrigramIndex:
+        entries = listing_cache.entries(directory)
+        key = (os.fspath(directory), suffixes)
+        with self._lock:
+            cached = self._cache.get(key)
+        # An unchanged cached listing is returned as the very same tuple
+        if cached is not None and cached[0] is entries:
+            return cached[1]
+
+        if suffixes is None:
+            names = [e.name for e in entries if e.is_dir and not e.name.startswith(".")]
+        else:
+            names = [e.name for e in entries if e.is_file and e.name.endswith(suffixes)]
+        if cached is not None and cached[1].names == names:
+            index = cached[1]
+        else:
+            index = TrigramIndex(names, suffixes or ())
+
+        with self._lock:
+            self._cache[key] = (entries, index)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_dirs:
+                self._cache.popitem(last=False)
+        return index
+
+    def dirs(self, directory: Path) -> TrigramIndex:
+        """Return the index of visible subdirectory names."""
+        return self._get(directory, None)
+
+    def files(self, directory: Path, *suffixes: str) -> TrigramIndex:
+        """Return the index of file names ending with one of suffixes."""
+        return self._get(directory, suffixes)
+
+
+# Shared by all services, like the listing cache it is built from
+name_index = NameIndexCache()